@@ -0,0 +1,152 @@
+"""
+Benchmark suite for the client: decoding, board hydration, board lookups,
+the logics and a full tick against a local stub server, on synthetic boards
+of several sizes. Results are written as JSON and can be compared against a
+baseline file from an earlier run.
+
+Run from the src directory: python -m bench --out results.json
+Compare with an earlier run: python -m bench --baseline results.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List
+
+from dacite import from_dict
+
+from bench.payloads import make_board_payload
+from bench.stub_server import StubServer
+from decode import decode
+from game.api import Api
+from game.loader import load
+from game.logic.pesemka import Pesemka
+from game.logic.random import RandomLogic
+from game.models import Board, Bot
+
+SIZES = {
+    "small": dict(width=15, height=15, diamonds=10, bots=4, teleporter_pairs=1),
+    "medium": dict(width=40, height=40, diamonds=100, bots=10, teleporter_pairs=2),
+    "large": dict(width=80, height=80, diamonds=1000, bots=100, teleporter_pairs=4),
+    "huge": dict(width=120, height=120, diamonds=1000, bots=1000, teleporter_pairs=8),
+}
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> Dict:
+    """
+    Time func with enough calls per run to last at least min_time
+    :return: dict with the calls per run and per call min/median in us
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    runs = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "min_us": min(runs),
+        "median_us": statistics.median(runs),
+    }
+
+
+def run_size(size: str, with_server: bool) -> List[Dict]:
+    payload = make_board_payload(**SIZES[size])
+    data = decode(payload)
+    board = load(Board, data)
+    bot = Bot(name="bot0", email="", id="bot0")
+    board_bot = board.get_bot(bot)
+
+    def cold_get_bot():
+        board.invalidate()
+        return board.get_bot(bot)
+
+    pesemka, random_logic = Pesemka(), RandomLogic()
+    benches = {
+        "decode": lambda: decode(payload),
+        "dacite.from_dict": lambda: from_dict(Board, data),
+        "loader.load": lambda: load(Board, data),
+        "Board.get_bot": lambda: board.get_bot(bot),
+        "Board.get_bot (cold index)": cold_get_bot,
+        "Pesemka.next_move": lambda: pesemka.next_move(board_bot, board),
+        "RandomLogic.next_move": lambda: random_logic.next_move(board_bot, board),
+    }
+
+    results = []
+    for name, func in benches.items():
+        results.append({"bench": name, "size": size, **measure(func)})
+        _report(results[-1])
+
+    if with_server:
+        with StubServer(payload) as server:
+            api = Api(server.url)
+            tick_logic = Pesemka()
+
+            def tick():
+                new_board = api.bots_move("bot0", "NORTH")
+                new_bot = new_board.get_bot(bot)
+                return tick_logic.next_move(new_bot, new_board)
+
+            results.append({"bench": "full tick", "size": size, **measure(tick)})
+            _report(results[-1])
+            api.close()
+    return results
+
+
+def _report(result: Dict, baseline: Dict = None):
+    line = "{:8} {:28} {:12.1f} us".format(
+        result["size"], result["bench"], result["min_us"]
+    )
+    if baseline:
+        ratio = result["min_us"] / baseline["min_us"]
+        line += "  {:6.2f}x baseline{}".format(ratio, "  SLOWER" if ratio > 1.1 else "")
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--size",
+        action="append",
+        choices=list(SIZES),
+        help="Board sizes to run, can be given multiple times. Default: all",
+    )
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against the results in this JSON file")
+    parser.add_argument(
+        "--no-server", action="store_true", help="Skip the full tick against the stub server"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for size in args.size or list(SIZES):
+        results.extend(run_size(size, not args.no_server))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(r["bench"], r["size"]): r for r in json.load(f)["results"]}
+        print("\nCompared with {}".format(args.baseline))
+        for result in results:
+            previous = baseline.get((result["bench"], result["size"]))
+            if previous:
+                _report(result, previous)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                {
+                    "created": time.time(),
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Requests per second of game.api.Api against a local stub server, with and
+without the pooled keep-alive session.
+
+Run from the src directory: python -m bench.bench_api
+"""
+import argparse
+import time
+
+from bench.stub_server import StubServer
+from game.api import Api
+
+
+def _requests_per_second(api: Api, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        if i % 2:
+            api.boards_get("1")
+        else:
+            api.bots_move("token", "NORTH")
+    elapsed = time.perf_counter() - start
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=500, help="Requests per run")
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        unpooled = Api(server.url, pooled=False)
+        pooled = Api(server.url, pooled=True)
+        before = _requests_per_second(unpooled, args.n)
+        after = _requests_per_second(pooled, args.n)
+        pooled.close()
+
+    print("new connection per request: {:8.1f} req/s".format(before))
+    print("pooled keep-alive session:  {:8.1f} req/s".format(after))
+    print("speedup: {:.2f}x".format(after / before))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time decode.decode against the previous recursive implementation on board
+payloads of realistic size.
+
+Run from the src directory: python -m bench.bench_decode
+"""
+import argparse
+import re
+import timeit
+
+from bench.payloads import make_board_payload
+from decode import decode
+
+
+def _snake_case_reference(value):
+    first_underscore = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", value)
+    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", first_underscore).lower()
+
+
+def _decode_keys_reference(data):
+    # decode.decode_keys before the memoized single pass version
+    formatted = {}
+    snake = {_snake_case_reference(key): value for key, value in data.items()}
+    for key, value in snake.items():
+        if isinstance(value, dict):
+            formatted[key] = _decode_keys_reference(value)
+        elif isinstance(value, list) and len(value) > 0:
+            formatted[key] = []
+            for val in value:
+                formatted[key].append(_decode_keys_reference(val))
+        else:
+            formatted[key] = value
+    return formatted
+
+
+SIZES = [
+    ("15x15, 20 diamonds, 4 bots", dict(width=15, height=15, diamonds=20, bots=4)),
+    ("30x30, 100 diamonds, 10 bots", dict(width=30, height=30, diamonds=100, bots=10)),
+    ("60x60, 400 diamonds, 40 bots", dict(width=60, height=60, diamonds=400, bots=40)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=200, help="Decodes per measurement")
+    args = parser.parse_args()
+
+    for label, size in SIZES:
+        payload = make_board_payload(**size)
+        assert decode(payload) == _decode_keys_reference(payload)
+        before = min(
+            timeit.repeat(lambda: _decode_keys_reference(payload), number=args.n, repeat=3)
+        )
+        after = min(timeit.repeat(lambda: decode(payload), number=args.n, repeat=3))
+        print(
+            "{:32} before {:8.1f} us  after {:8.1f} us  speedup {:.2f}x".format(
+                label,
+                before / args.n * 1e6,
+                after / args.n * 1e6,
+                before / after,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Per tick cost of the target distance fields of Pesemka, recomputed from
+scratch on every tick against the incremental DistanceFields cache, and
+the whole Pesemka.next_move with and without the cache.
+
+Run from the src directory: python -m bench.bench_distance_cache
+"""
+import argparse
+import copy
+import random
+import time
+from typing import List
+
+from bench.payloads import make_board_payload
+from decode import decode
+from game.distance_cache import TARGET_TYPES, DistanceFields
+from game.loader import load
+from game.logic.pesemka import Pesemka
+from game.models import Board
+
+SIZES = [
+    ("15x15, 20 diamonds", dict(width=15, height=15, diamonds=20, bots=4)),
+    ("40x40, 200 diamonds", dict(width=40, height=40, diamonds=200, bots=10)),
+    ("80x80, 1000 diamonds", dict(width=80, height=80, diamonds=1000, bots=20)),
+]
+
+
+def make_ticks(ticks: int, seed: int = 0, **size) -> List[Board]:
+    """
+    Consecutive boards where every bot moves one step and a diamond is
+    collected and respawned every few ticks
+    """
+    rng = random.Random(seed)
+    payload = make_board_payload(seed=seed, teleporter_pairs=2, **size)
+    width, height = payload["width"], payload["height"]
+    next_id = max(o["id"] for o in payload["gameObjects"]) + 1
+    boards = []
+    for tick in range(ticks):
+        objects = payload["gameObjects"]
+        for obj in objects:
+            if obj["type"] == "BotGameObject":
+                pos = obj["position"]
+                pos["x"] = min(max(pos["x"] + rng.choice((-1, 1)), 0), width - 1)
+        if tick % 3 == 0:
+            diamonds = [o for o in objects if o["type"] == "DiamondGameObject"]
+            objects.remove(rng.choice(diamonds))
+            objects.append(
+                {
+                    "id": next_id,
+                    "position": {"x": rng.randrange(width), "y": rng.randrange(height)},
+                    "type": "DiamondGameObject",
+                    "properties": {"points": 1},
+                }
+            )
+            next_id += 1
+        boards.append(load(Board, decode(copy.deepcopy(payload))))
+    return boards
+
+
+def _targets(board: Board):
+    return [o for t in TARGET_TYPES for o in board.objects_by_type(t)]
+
+
+def _next_move(boards: List[Board], logic: Pesemka) -> float:
+    start = time.perf_counter()
+    for board in boards:
+        logic.next_move(board.bots[0], board)
+    return (time.perf_counter() - start) / len(boards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=200, help="Ticks per board size")
+    args = parser.parse_args()
+
+    for label, size in SIZES:
+        boards = make_ticks(args.ticks, **size)
+        scratch = Pesemka(distance_cache=False)
+        start = time.perf_counter()
+        expected = []
+        for board in boards:
+            src = board.bots[0].position
+            scratch.refresh_teleporters(board)
+            expected.append(
+                [scratch.distance_via_tp(src, o.position) for o in _targets(board)]
+            )
+        without_cache = (time.perf_counter() - start) / len(boards)
+
+        fields = DistanceFields()
+        recomputed = 0
+        start = time.perf_counter()
+        actual = []
+        for board in boards:
+            src = board.bots[0].position
+            fields.update(board)
+            recomputed += fields.recomputed
+            actual.append([fields.via_tp(src, o) for o in _targets(board)])
+        with_cache = (time.perf_counter() - start) / len(boards)
+
+        assert actual == expected
+        print(
+            "{:22} without cache {:8.1f} us/tick  with cache {:8.1f} us/tick  "
+            "targets recomputed {:6.1f}/tick of {}".format(
+                label,
+                without_cache * 1e6,
+                with_cache * 1e6,
+                recomputed / len(boards),
+                len(_targets(boards[-1])),
+            )
+        )
+        print(
+            "{:22} next_move      {:8.1f} us/tick  with cache {:8.1f} us/tick".format(
+                "",
+                _next_move(boards, Pesemka(distance_cache=False)) * 1e6,
+                _next_move(boards, Pesemka(distance_cache=True)) * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Tick latency as the number of bots run from one event loop grows, with the
+logic computed on the event loop, on worker threads and on worker processes.
+Every bot ticks at a fixed interval; the latency of a tick is the time from
+its scheduled start until the server answered the move, so time a bot
+spends waiting for the event loop counts too.
+
+Run from the src directory: python -m bench.bench_executor
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+
+from bench.payloads import make_board_payload
+from bench.stub_server import StubServer
+from game.api import Api, AsyncApi
+from game.bot_handler import AsyncBotHandler
+from game.logic import CONTROLLERS
+from game.logic.executor import ExecutorLogic, LogicWorkers
+from game.models import Board, Bot
+
+
+async def _bot(bot_handler, board: Board, name: str, logic, ticks: int, interval: float):
+    bot = Bot(name=name, email="", id=name)
+    latencies = []
+    start = time.perf_counter()
+    for tick in range(ticks):
+        tick_start = start + tick * interval
+        board_bot = board.get_bot(bot)
+        if isinstance(logic, ExecutorLogic):
+            delta_x, delta_y = await logic.next_move_async(board_bot, board)
+        else:
+            delta_x, delta_y = logic.next_move(board_bot, board)
+        board = await bot_handler.move(bot.id, 1, delta_x, delta_y) or board
+        latencies.append(time.perf_counter() - tick_start)
+        await asyncio.sleep(max(0.0, start + (tick + 1) * interval - time.perf_counter()))
+    return latencies
+
+
+async def _run(url: str, board: Board, mode: str, bots: int, args) -> list:
+    api = AsyncApi(Api(url, pool_size=max(bots, 10)))
+    bot_handler = AsyncBotHandler(api)
+    workers = None
+    if mode != "inline":
+        workers = LogicWorkers(args.workers, processes=mode == "process")
+    logics = [
+        workers.adapter(args.logic) if workers else CONTROLLERS[args.logic]()
+        for _ in range(bots)
+    ]
+    if workers:
+        # Start the workers before measuring
+        await asyncio.gather(
+            *(logic.next_move_async(board.get_bot(Bot("bot0", "", "")), board) for logic in logics)
+        )
+    try:
+        results = await asyncio.gather(
+            *(
+                _bot(bot_handler, board, "bot{}".format(i), logic, args.ticks, args.interval)
+                for i, logic in enumerate(logics)
+            )
+        )
+    finally:
+        api.close()
+        if workers:
+            workers.close()
+    return [latency for latencies in results for latency in latencies]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logic", default="PesemkaTour", choices=list(CONTROLLERS))
+    parser.add_argument("--bots", type=int, action="append", help="Bot counts to run")
+    parser.add_argument("--ticks", type=int, default=30, help="Ticks per bot")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds per tick")
+    parser.add_argument(
+        "--workers", type=int, default=multiprocessing.cpu_count(), help="Logic workers"
+    )
+    parser.add_argument("--diamonds", type=int, default=300)
+    args = parser.parse_args()
+    bot_counts = args.bots or [1, 2, 4, 8]
+
+    payload = make_board_payload(
+        width=60, height=60, diamonds=args.diamonds, bots=max(bot_counts), teleporter_pairs=2
+    )
+    print("{} logic, {} workers, {} CPUs".format(args.logic, args.workers, multiprocessing.cpu_count()))
+    print("{:>5} {:>8} {:>12} {:>12}".format("bots", "mode", "median ms", "p95 ms"))
+    with StubServer(payload) as server:
+        api = Api(server.url)
+        board = api.boards_get("1")
+        api.close()
+        for bots in bot_counts:
+            for mode in ("inline", "thread", "process"):
+                latencies = sorted(asyncio.run(_run(server.url, board, mode, bots, args)))
+                print(
+                    "{:5} {:>8} {:12.2f} {:12.2f}".format(
+                        bots,
+                        mode,
+                        statistics.median(latencies) * 1000,
+                        latencies[int(len(latencies) * 0.95)] * 1000,
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
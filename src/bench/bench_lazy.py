@@ -0,0 +1,82 @@
+"""
+Per tick cost of turning a board response into a move: parsing the JSON,
+building the board and running the logic, with the eager Board of
+loader.load against LazyBoard, and the eager Board parsed with the JSON
+parser of LazyBoard to tell both gains apart, for RandomLogic that reads almost nothing
+of the board and for Pesemka that reads most of it.
+
+Run from the src directory: python -m bench.bench_lazy
+"""
+import argparse
+import json
+import timeit
+
+from bench.payloads import make_board_payload
+from decode import decode
+from game.api import unwrap_response
+from game.lazy_board import LazyBoard, loads, orjson
+from game.loader import load
+from game.logic.pesemka import Pesemka
+from game.logic.random import RandomLogic
+from game.models import Board, Bot
+
+SIZES = [
+    ("15x15, 20 diamonds, 4 bots", dict(width=15, height=15, diamonds=20, bots=4)),
+    ("40x40, 100 diamonds, 10 bots", dict(width=40, height=40, diamonds=100, bots=10)),
+    ("80x80, 1000 diamonds, 100 bots", dict(width=80, height=80, diamonds=1000, bots=100)),
+]
+BOT = Bot(name="bot0", email="", id="bot0")
+
+
+def _eager(raw: bytes) -> Board:
+    return load(Board, decode(unwrap_response(json.loads(raw))))
+
+
+def _eager_fast_json(raw: bytes) -> Board:
+    return load(Board, decode(unwrap_response(loads(raw))))
+
+
+def _lazy(raw: bytes) -> Board:
+    return LazyBoard(unwrap_response(loads(raw)))
+
+
+def _tick(make, logic):
+    def tick(raw: bytes):
+        board = make(raw)
+        if logic is not None:
+            logic.next_move(board.get_bot(BOT), board)
+
+    return tick
+
+
+def _time(func, raw: bytes, number: int) -> float:
+    return min(timeit.repeat(lambda: func(raw), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=200, help="Ticks per run")
+    args = parser.parse_args()
+
+    print("JSON parser of LazyBoard: {}".format("orjson" if orjson else "json"))
+    for label, size in SIZES:
+        raw = json.dumps({"data": make_board_payload(**size)}).encode()
+        print("{} ({:.1f} KB)".format(label, len(raw) / 1024))
+        for logic_name, make_logic in (
+            ("parse only", lambda: None),
+            ("RandomLogic", RandomLogic),
+            ("Pesemka", Pesemka),
+        ):
+            eager = _time(_tick(_eager, make_logic()), raw, args.n)
+            fast_json = _time(_tick(_eager_fast_json, make_logic()), raw, args.n)
+            lazy = _time(_tick(_lazy, make_logic()), raw, args.n)
+            print(
+                "  {:12} eager {:8.1f} us  eager, same parser {:8.1f} us  "
+                "lazy {:8.1f} us  speedup {:5.2f}x".format(
+                    logic_name, eager, fast_json, lazy, eager / lazy
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Board parse throughput and memory of game.loader.load on the slotted models
+against dacite.from_dict on the previous models with a __dict__ per object.
+
+Run from the src directory: python -m bench.bench_loader
+"""
+import argparse
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import List, Optional
+
+from dacite import from_dict
+
+from bench.payloads import make_board_payload
+from decode import decode
+from game.loader import load
+from game.models import Board, Feature
+
+
+@dataclass
+class _Position:
+    y: int
+    x: int
+
+
+@dataclass
+class _Base(_Position): ...
+
+
+@dataclass
+class _Properties:
+    points: Optional[int] = None
+    pair_id: Optional[str] = None
+    diamonds: Optional[int] = None
+    score: Optional[int] = None
+    name: Optional[str] = None
+    inventory_size: Optional[int] = None
+    can_tackle: Optional[bool] = None
+    milliseconds_left: Optional[int] = None
+    time_joined: Optional[str] = None
+    base: Optional[_Base] = None
+
+
+@dataclass
+class _GameObject:
+    id: int
+    position: _Position
+    type: str
+    properties: Optional[_Properties] = None
+
+
+@dataclass
+class _Board:
+    id: int
+    width: int
+    height: int
+    features: List[Feature]
+    minimum_delay_between_moves: int
+    game_objects: Optional[List[_GameObject]]
+
+SIZES = [
+    ("15x15, 20 diamonds, 4 bots", dict(width=15, height=15, diamonds=20, bots=4)),
+    ("30x30, 100 diamonds, 10 bots", dict(width=30, height=30, diamonds=100, bots=10)),
+    ("60x60, 400 diamonds, 40 bots", dict(width=60, height=60, diamonds=400, bots=40)),
+]
+
+
+def _allocated(func, cls, data) -> int:
+    tracemalloc.start()
+    board = func(cls, data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del board
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100, help="Parses per measurement")
+    args = parser.parse_args()
+
+    for label, size in SIZES:
+        data = decode(make_board_payload(**size))
+        assert load(Board, data) == from_dict(Board, data)
+        before = min(
+            timeit.repeat(lambda: from_dict(_Board, data), number=args.n, repeat=3)
+        )
+        after = min(timeit.repeat(lambda: load(Board, data), number=args.n, repeat=3))
+        print(
+            "{:32} dacite {:7.0f} boards/s {:8} B  loader {:7.0f} boards/s {:8} B".format(
+                label,
+                args.n / before,
+                _allocated(from_dict, _Board, data),
+                args.n / after,
+                _allocated(load, Board, data),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Check that the NumPy target scoring of Pesemka picks exactly the same
+targets and moves as the loop version, then time both.
+
+Run from the src directory: python -m bench.bench_scoring
+"""
+import argparse
+import random
+import timeit
+
+from bench.payloads import make_board_payload
+from decode import decode
+from game.board_array import BoardArrays, best_target
+from game.loader import load
+from game.logic.pesemka import Pesemka
+from game.models import Board
+
+SIZES = [
+    ("15x15, 20 diamonds", dict(width=15, height=15, diamonds=20, teleporter_pairs=1)),
+    ("40x40, 200 diamonds", dict(width=40, height=40, diamonds=200, teleporter_pairs=3)),
+    ("80x80, 1000 diamonds", dict(width=80, height=80, diamonds=1000, teleporter_pairs=5)),
+]
+
+
+def _board(seed: int, **size) -> Board:
+    return load(Board, decode(make_board_payload(seed=seed, **size)))
+
+
+def check(boards: int = 300):
+    """
+    Compare both versions on random boards, bot positions and inventories
+    """
+    rng = random.Random(0)
+    for seed in range(boards):
+        _, size = SIZES[seed % 2]
+        board = _board(seed, **size)
+        loop, vectorized = Pesemka(vectorized=False), Pesemka(vectorized=True)
+        for board_bot in board.bots:
+            board_bot.properties.diamonds = rng.randrange(5)
+            loop.refresh_teleporters(board)
+            current, carried = board_bot.position, board_bot.properties.diamonds
+            expected = loop.best_candidate(current, carried, board)
+            actual = best_target(
+                BoardArrays.from_board(board), current, carried, loop.teleporter_pairs
+            )
+            assert expected is actual, (seed, board_bot.id)
+            assert loop.next_move(board_bot, board) == vectorized.next_move(
+                board_bot, board
+            )
+            assert loop.post_tp_target == vectorized.post_tp_target
+    print("{} boards: identical decisions".format(boards))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=50, help="Moves per measurement")
+    args = parser.parse_args()
+
+    check()
+    for label, size in SIZES:
+        board = _board(1, **size)
+        board_bot = board.bots[0]
+        board_bot.properties.diamonds = 1
+        timings = []
+        for vectorized in (False, True):
+            logic = Pesemka(vectorized=vectorized)
+            timings.append(
+                min(
+                    timeit.repeat(
+                        lambda: logic.next_move(board_bot, board),
+                        number=args.n,
+                        repeat=3,
+                    )
+                )
+                / args.n
+            )
+        print(
+            "{:22} loop {:8.1f} us  numpy {:8.1f} us  speedup {:.2f}x".format(
+                label, timings[0] * 1e6, timings[1] * 1e6, timings[0] / timings[1]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Moves per second of the headless simulator with the registered logics.
+
+Run from the src directory: python -m bench.bench_simulator
+"""
+import argparse
+import random
+import time
+
+from game.logic import CONTROLLERS
+from game.simulator import Simulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bots", type=int, default=4, help="Bots per logic")
+    args = parser.parse_args()
+
+    for name in CONTROLLERS:
+        random.seed(args.seed)
+        sim = Simulator(seed=args.seed)
+        for i in range(args.bots):
+            sim.add_bot("{}{}".format(name, i), CONTROLLERS[name]())
+        start = time.perf_counter()
+        scores = sim.run()
+        elapsed = time.perf_counter() - start
+        moves = sum(b.moves + b.invalid_moves for b in sim.finished)
+        print(
+            "{:12} {:8.0f} moves/s  scores {}".format(
+                name, moves / elapsed, sorted(scores.values(), reverse=True)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
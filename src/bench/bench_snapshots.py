@@ -0,0 +1,98 @@
+"""
+Memory of keeping 1000 ticks of board history as Board objects against the
+SnapshotStore keyframe and deltas, on simulator games, and the time to
+rebuild a past tick. Every rebuilt board is checked against the original.
+
+Run from the src directory: python -m bench.bench_snapshots
+"""
+import argparse
+import copy
+import gc
+import random
+import time
+import tracemalloc
+
+from game.logic import CONTROLLERS
+from game.models import Config
+from game.simulator import Simulator
+from game.snapshots import SnapshotStore
+
+SIZES = [
+    ("15x15, 4 bots", dict(width=15, height=15), 4),
+    ("40x40, 10 bots", dict(width=40, height=40), 10),
+    ("80x80, 20 bots", dict(width=80, height=80), 20),
+]
+
+
+def _boards(ticks: int, bots: int, **size):
+    sim = Simulator(config=Config(seconds=ticks), seed=bots, **size)
+    for i in range(bots):
+        sim.add_bot("bot{}".format(i), CONTROLLERS["Pesemka"]())
+    for _ in range(ticks):
+        sim.step()
+        yield sim.board()
+
+
+def _measure(make):
+    gc.collect()
+    tracemalloc.start()
+    kept = make()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, size
+
+
+def _same(a, b) -> bool:
+    key = lambda o: o.id
+    return (
+        sorted(a.game_objects, key=key) == sorted(b.game_objects, key=key)
+        and a.features == b.features
+        and (a.id, a.width, a.height) == (b.id, b.width, b.height)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--keyframe-every", type=int, default=None)
+    args = parser.parse_args()
+
+    for label, size, bots in SIZES:
+        boards = list(_boards(args.ticks, bots, **size))
+
+        def keep_store():
+            store = SnapshotStore(args.keyframe_every)
+            for board in boards:
+                store.append(board)
+            return store
+
+        # Copies share nothing, like boards loaded from separate responses
+        _, board_bytes = _measure(lambda: copy.deepcopy(boards))
+        store, store_bytes = _measure(keep_store)
+
+        rng = random.Random(0)
+        ticks = [rng.randrange(len(store)) for _ in range(50)]
+        start = time.perf_counter()
+        for tick in ticks:
+            assert _same(store.board(tick), boards[tick]), tick
+        rebuild = (time.perf_counter() - start) / len(ticks)
+        for tick in range(len(store)):
+            assert _same(store.board(tick), boards[tick]), tick
+
+        per_1000 = 1000 / len(boards)
+        print(
+            "{:16} Board objects {:8.1f} KB  store {:7.1f} KB (columns {:6.1f} KB)  "
+            "saved {:8.1f} KB per 1000 ticks  rebuild {:6.2f} ms".format(
+                label,
+                board_bytes * per_1000 / 1024,
+                store_bytes * per_1000 / 1024,
+                store.nbytes * per_1000 / 1024,
+                (board_bytes - store_bytes) * per_1000 / 1024,
+                rebuild * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
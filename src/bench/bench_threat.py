@@ -0,0 +1,84 @@
+"""
+Per tick cost of the threat map of PesemkaSafe with many bots on the board,
+rebuilt from scratch against the incremental ThreatMap, and a check that
+both give the same grid. Every tick a share of the bots takes a step, in
+a game that is most of them.
+
+Run from the src directory: python -m bench.bench_threat
+"""
+import argparse
+import random
+import time
+
+from game.logic import CONTROLLERS
+from game.simulator import Simulator
+from game.threat import ThreatMap
+
+
+def make_ticks(bots: int, ticks: int, moving: float):
+    rng = random.Random(bots)
+    sim = Simulator(40, 40, seed=bots)
+    for i in range(bots):
+        sim.add_bot("bot{}".format(i), CONTROLLERS["Random"]())
+    boards = []
+    for _ in range(ticks):
+        for bot in rng.sample(sim.bots, round(len(sim.bots) * moving)):
+            bot.x = min(max(bot.x + rng.choice((-1, 1)), 0), sim.width - 1)
+        boards.append(sim.board())
+    return boards
+
+
+def _run(boards, rebuild: bool):
+    """
+    :return: (seconds per tick, enemies updated, grid of every tick)
+    """
+    threats = ThreatMap()
+    elapsed = 0.0
+    changed = 0
+    grids = []
+    for board in boards:
+        board_bot = board.bots[0]
+        if rebuild:
+            threats.grid = None
+        start = time.perf_counter()
+        threats.update(board, board_bot)
+        elapsed += time.perf_counter() - start
+        changed += threats.changed
+        grids.append(threats.grid.copy())
+    return elapsed / len(boards), changed, grids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--bots", type=int, action="append", help="Bot counts to run")
+    parser.add_argument(
+        "--moving", type=float, action="append", help="Share of bots moving per tick"
+    )
+    args = parser.parse_args()
+
+    for moving in args.moving or [1.0, 0.5, 0.2]:
+        for bots in args.bots or [5, 20, 50]:
+            boards = make_ticks(bots, args.ticks, moving)
+            for board in boards:
+                # Builds the board index outside of the timed updates
+                board.bots
+            # Each in its own pass, interleaving them favours the second one
+            rebuilt, _, expected = _run(boards, rebuild=True)
+            incremental, changed, actual = _run(boards, rebuild=False)
+            assert all((a == e).all() for a, e in zip(actual, expected))
+
+            print(
+                "{:3.0%} moving {:3} bots  rebuilt {:8.1f} us/tick  "
+                "incremental {:8.1f} us/tick  enemies updated {:5.1f}/tick".format(
+                    moving,
+                    bots,
+                    rebuilt * 1e6,
+                    incremental * 1e6,
+                    changed / len(boards),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Bytes received and reaction latency of reading the board with GET polling
+against the server-sent events stream, on a local stub server whose board
+changes every tick. Reaction latency is the time from a change on the
+server until the client holds a board with that change. Polling reads the
+board once per tick, like a bot does.
+
+Run from the src directory: python -m bench.bench_transport
+"""
+import argparse
+import statistics
+import time
+
+from bench.payloads import make_board_payload
+from bench.stub_server import StreamStubServer
+from game.api import Api
+from game.models import Board
+from game.transport import PollingTransport, StreamTransport
+
+
+def _signature(board: Board) -> tuple:
+    return tuple(sorted((o.id, o.position.x, o.position.y) for o in board.game_objects))
+
+
+def _watch(server: StreamStubServer, transport, seconds: float) -> dict:
+    api = Api(server.url, transport=transport)
+    seen = set()
+    latencies = []
+    version = -1
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        if isinstance(transport, StreamTransport):
+            version = transport.wait_for_update(version, server.interval)
+        board = api.boards_get(1)
+        now = time.perf_counter()
+        signature = _signature(board)
+        changed_at = server.changed_at.get(signature)
+        if signature not in seen and changed_at is not None:
+            seen.add(signature)
+            latencies.append(now - changed_at)
+        if isinstance(transport, PollingTransport):
+            time.sleep(max(0.0, server.interval - (time.perf_counter() - now)))
+    api.close()
+    latencies.sort()
+    return {
+        "bytes": transport.bytes_received,
+        "seen": len(seen),
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Seconds per transport")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds per tick")
+    parser.add_argument("--diamonds", type=int, default=100)
+    parser.add_argument("--bots", type=int, default=10)
+    args = parser.parse_args()
+
+    payload = make_board_payload(
+        width=40, height=40, diamonds=args.diamonds, bots=args.bots, teleporter_pairs=2
+    )
+    for name, transport in (("polling", PollingTransport()), ("stream", StreamTransport())):
+        with StreamStubServer(payload, args.interval) as server:
+            result = _watch(server, transport, args.seconds)
+            ticks = len(server.diffs)
+        print(
+            "{:8} {:9.1f} KB received {:7.0f} B/tick  changes seen {:3}/{:3}  "
+            "reaction median {:6.1f} ms  p95 {:6.1f} ms".format(
+                name,
+                result["bytes"] / 1024,
+                result["bytes"] / max(ticks, 1),
+                result["seen"],
+                ticks + 1,
+                result["median_ms"],
+                result["p95_ms"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
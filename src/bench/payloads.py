@@ -0,0 +1,118 @@
+import random
+from typing import List, Optional
+
+
+def _position(rng: random.Random, width: int, height: int, taken: set) -> dict:
+    while True:
+        x, y = rng.randrange(width), rng.randrange(height)
+        if (x, y) not in taken:
+            taken.add((x, y))
+            return {"x": x, "y": y}
+
+
+def make_board_payload(
+    width: int = 15,
+    height: int = 15,
+    diamonds: int = 20,
+    bots: int = 4,
+    teleporter_pairs: int = 1,
+    seed: Optional[int] = 0,
+) -> dict:
+    """
+    Build a board response in the same camelCase shape the game server sends
+    :param width: board width
+    :param height: board height
+    :param diamonds: number of diamonds on the board
+    :param bots: number of bots (and bases) on the board
+    :param teleporter_pairs: number of teleporter pairs
+    :param seed: seed for the object placement
+    :return: dict
+    """
+    rng = random.Random(seed)
+    taken = set()
+    objects: List[dict] = []
+    next_id = 1
+
+    for i in range(bots):
+        name = "bot{}".format(i)
+        base = _position(rng, width, height, taken)
+        objects.append(
+            {
+                "id": next_id,
+                "position": base,
+                "type": "BaseGameObject",
+                "properties": {"name": name},
+            }
+        )
+        objects.append(
+            {
+                "id": next_id + 1,
+                "position": _position(rng, width, height, taken),
+                "type": "BotGameObject",
+                "properties": {
+                    "diamonds": rng.randrange(5),
+                    "score": rng.randrange(20),
+                    "name": name,
+                    "inventorySize": 5,
+                    "canTackle": True,
+                    "millisecondsLeft": 60000,
+                    "timeJoined": "2024-03-01T10:00:00.000Z",
+                    "base": dict(base),
+                },
+            }
+        )
+        next_id += 2
+
+    for i in range(teleporter_pairs):
+        for _ in range(2):
+            objects.append(
+                {
+                    "id": next_id,
+                    "position": _position(rng, width, height, taken),
+                    "type": "TeleportGameObject",
+                    "properties": {"pairId": str(i)},
+                }
+            )
+            next_id += 1
+
+    for _ in range(diamonds):
+        objects.append(
+            {
+                "id": next_id,
+                "position": _position(rng, width, height, taken),
+                "type": "DiamondGameObject",
+                "properties": {"points": 2 if rng.random() < 0.2 else 1},
+            }
+        )
+        next_id += 1
+
+    objects.append(
+        {
+            "id": next_id,
+            "position": _position(rng, width, height, taken),
+            "type": "DiamondButtonGameObject",
+            "properties": {},
+        }
+    )
+
+    return {
+        "id": 1,
+        "width": width,
+        "height": height,
+        "features": [
+            {"name": "DiamondButtonProvider", "config": None},
+            {
+                "name": "DiamondProvider",
+                "config": {
+                    "generationRatio": 0.1,
+                    "minRatioForGeneration": 0.01,
+                    "redRatio": 0.2,
+                },
+            },
+            {"name": "TeleportProvider", "config": {"pairs": teleporter_pairs}},
+            {"name": "BotProvider", "config": {"inventorySize": 5, "canTackle": True}},
+            {"name": "SessionProvider", "config": {"seconds": 60}},
+        ],
+        "minimumDelayBetweenMoves": 100,
+        "gameObjects": objects,
+    }
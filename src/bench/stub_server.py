@@ -0,0 +1,250 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from bench.payloads import make_board_payload
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so that clients can keep the connection alive
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, without this every kept-alive
+    # response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if body is self.server.board_body:
+            self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+    def do_GET(self):
+        self._read_body()
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 3 and parts[1] == "bots":
+            # Bot tokens are the bot names of the stub board
+            bot = {"id": parts[2], "name": parts[2], "email": parts[2] + "@stub"}
+            self._send_json(200, json.dumps({"data": bot}).encode())
+        elif self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.server.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(200, self.server.board_body)
+
+    def do_POST(self):
+        self._read_body()
+        if self.path.endswith("/recover"):
+            self._send_json(404, b'{"message": "Not found"}')
+        elif self.path.endswith("/join"):
+            self._send_json(200, b"{}")
+        else:
+            self._send_json(200, self.server.board_body)
+
+
+class StubServer:
+    """
+    Minimal local game server answering every request with the same board
+    """
+
+    def __init__(self, payload: Optional[dict] = None, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.board_body = json.dumps(
+            {"data": payload or make_board_payload()}
+        ).encode()
+        self.httpd.etag = '"{}"'.format(hashlib.sha1(self.httpd.board_body).hexdigest())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return "http://{}:{}/api".format(host, port)
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _StreamStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        # Api sends a JSON body with every request, GET included
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        server = self.server.stub
+        parts = self.path.strip("/").split("/")
+        if self.path.endswith("/stream"):
+            self._stream(server)
+        elif len(parts) == 3 and parts[1] == "bots":
+            bot = {"id": parts[2], "name": parts[2], "email": parts[2] + "@stub"}
+            self._send_json(json.dumps({"data": bot}).encode())
+        else:
+            self._send_json(server.board_body())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.path.endswith("/join"):
+            self._send_json(b"{}")
+        else:
+            # Moves are accepted and answered with the board
+            self._send_json(self.server.stub.board_body())
+
+    def _send_json(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _stream(self, server: "StreamStubServer"):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        with server.changed:
+            sent = len(server.diffs)
+            snapshot = json.dumps(server.board).encode()
+        try:
+            self._chunk(b"event: snapshot\ndata: " + snapshot + b"\n\n")
+            while not server.stopped:
+                with server.changed:
+                    server.changed.wait_for(
+                        lambda: len(server.diffs) > sent or server.stopped, 0.5
+                    )
+                    diffs = server.diffs[sent:]
+                sent += len(diffs)
+                for diff in diffs:
+                    self._chunk(b"event: diff\ndata: " + diff + b"\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+
+class StreamStubServer:
+    """
+    Minimal local game server whose board changes every interval seconds:
+    every bot takes a random step and a diamond is collected and respawned.
+    Serves the board with GET /boards/{id} and its changes as server-sent
+    events with GET /boards/{id}/stream, for game.transport.StreamTransport.
+    Bots and moves are answered like StubServer does.
+    The time of every change is kept by board signature in changed_at.
+    """
+
+    def __init__(self, payload: Optional[dict] = None, interval: float = 0.1, seed: int = 0):
+        self.board = payload or make_board_payload()
+        self.interval = interval
+        self.rng = random.Random(seed)
+        self.changed = threading.Condition()
+        self.diffs: List[bytes] = []
+        self.changed_at: Dict[tuple, float] = {self.signature(self.board): time.perf_counter()}
+        self.stopped = False
+        self._body: Optional[bytes] = None
+        self._next_id = max(o["id"] for o in self.board["gameObjects"]) + 1
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StreamStubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.threads = [
+            threading.Thread(target=self.httpd.serve_forever, daemon=True),
+            threading.Thread(target=self._tick_loop, daemon=True),
+        ]
+
+    @staticmethod
+    def signature(board: dict) -> tuple:
+        return tuple(
+            sorted(
+                (o["id"], o["position"]["x"], o["position"]["y"]) for o in board["gameObjects"]
+            )
+        )
+
+    def board_body(self) -> bytes:
+        with self.changed:
+            if self._body is None:
+                self._body = json.dumps({"data": self.board}).encode()
+            return self._body
+
+    def _step(self) -> bytes:
+        width, height = self.board["width"], self.board["height"]
+        objects = self.board["gameObjects"]
+        changed = []
+        for obj in objects:
+            if obj["type"] != "BotGameObject":
+                continue
+            x, y = obj["position"]["x"], obj["position"]["y"]
+            dx, dy = self.rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+            if 0 <= x + dx < width and 0 <= y + dy < height:
+                obj["position"] = {"x": x + dx, "y": y + dy}
+                changed.append(obj)
+        diamonds = [i for i, o in enumerate(objects) if o["type"] == "DiamondGameObject"]
+        removed = []
+        if diamonds:
+            i = self.rng.choice(diamonds)
+            removed.append(objects[i]["id"])
+            objects[i] = {
+                "id": self._next_id,
+                "position": {"x": self.rng.randrange(width), "y": self.rng.randrange(height)},
+                "type": "DiamondGameObject",
+                "properties": {"points": 1},
+            }
+            self._next_id += 1
+            changed.append(objects[i])
+        return json.dumps({"changed": changed, "removed": removed}).encode()
+
+    def _tick_loop(self):
+        while not self.stopped:
+            time.sleep(self.interval)
+            with self.changed:
+                self.diffs.append(self._step())
+                self._body = None
+                self.changed_at[self.signature(self.board)] = time.perf_counter()
+                self.changed.notify_all()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return "http://{}:{}/api".format(host, port)
+
+    def __enter__(self) -> "StreamStubServer":
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        with self.changed:
+            self.stopped = True
+            self.changed.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,15 +1,12 @@
 import re
+from functools import lru_cache
 
 
-def _unpack(data):
-    if isinstance(data, dict):
-        return data.items()
-    return data
-
-
+@lru_cache(maxsize=1024)
 def _snake_case(value):
     """
-    Convert camel case string to snake case
+    Convert camel case string to snake case. The board uses the same few keys
+    on every tick, so results are memoized in a bounded table.
     :param value: string
     :return: string
     """
@@ -17,31 +14,37 @@ def _snake_case(value):
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", first_underscore).lower()
 
 
-def _keys_to_snake_case(content):
-    """
-    Convert all keys for given dict to snake case
-    :param content: dict
-    :return: dict
-    """
-    return {_snake_case(key): value for key, value in content.items()}
-
-
 def decode_keys(data):
     """
-    Convert all keys for given dict/list to snake case recursively
+    Convert all keys for given dict/list to snake case. Nested values are
+    walked with an explicit stack in a single pass, without recursion or
+    intermediate dicts.
     :param data: dict
     :return: dict
     """
+    snake_case = _snake_case
     formatted = {}
-    for key, value in _unpack(_keys_to_snake_case(data)):
-        if isinstance(value, dict):
-            formatted[key] = decode_keys(value)
-        elif isinstance(value, list) and len(value) > 0:
-            formatted[key] = []
-            for _, val in enumerate(value):
-                formatted[key].append(decode_keys(val))
-        else:
-            formatted[key] = value
+    stack = [(data, formatted)]
+    while stack:
+        source, target = stack.pop()
+        for key, value in source.items():
+            key = snake_case(key)
+            if isinstance(value, dict):
+                child = {}
+                target[key] = child
+                stack.append((value, child))
+            elif isinstance(value, list) and len(value) > 0:
+                items = []
+                target[key] = items
+                for item in value:
+                    if isinstance(item, dict):
+                        child = {}
+                        items.append(child)
+                        stack.append((item, child))
+                    else:
+                        items.append(item)
+            else:
+                target[key] = value
     return formatted
 
 
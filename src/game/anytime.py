@@ -0,0 +1,105 @@
+import threading
+from typing import Any, List, Optional, Tuple
+
+from game.logic.base import BaseLogic
+from game.models import Board, GameObject
+from game.pacing import Deadline
+
+
+class _Tick:
+    """
+    Moves of one tick with the logic state of each, shared with the worker
+    """
+
+    def __init__(self, state: Any):
+        self.moves: List[Tuple[Tuple[int, int], Any]] = []
+        # State of the logic before the tick, kept when no move was in time
+        self.state = state
+        # Set at the deadline, the worker records nothing after it
+        self.closed = False
+        # Set by the worker once it no longer touches the logic
+        self.done = False
+        # Set when the worker was still running at the deadline, it then
+        # restores the logic to restore_state itself
+        self.late = False
+        self.restore_state: Any = None
+
+
+class AnytimeRunner:
+    """
+    Enforce a deadline on a logic. The moves of BaseLogic.refine_moves are
+    collected on a worker thread and the last one ready at the deadline is
+    played. Without any move in time, or while the logic is still busy with
+    an earlier tick, the fallback move of the logic is played instead.
+
+    Every move is collected with a snapshot of the logic, and the logic is
+    restored to the snapshot of the move that was played. State changes of
+    refinements that missed the deadline are undone, by the worker itself
+    when it is still running at the deadline.
+    """
+
+    def __init__(self, logic: BaseLogic):
+        self.logic = logic
+        self.moves = 0
+        self.fallbacks = 0
+        self.late = 0
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _refine(self, board_bot: GameObject, board: Board, deadline: Deadline, tick: _Tick):
+        moves = self.logic.refine_moves(board_bot, board, deadline)
+        try:
+            for move in moves:
+                with self._lock:
+                    if tick.closed:
+                        break
+                    tick.moves.append((move, self.logic.snapshot()))
+                if deadline.expired:
+                    break
+        finally:
+            # Runs the cleanup of refine_moves before the state goes back
+            moves.close()
+            with self._lock:
+                tick.done = True
+                if tick.late:
+                    self.logic.restore(tick.restore_state)
+
+    def next_move(
+        self, board_bot: GameObject, board: Board, deadline: Deadline
+    ) -> Tuple[int, int]:
+        self.moves += 1
+        if self._worker is not None and self._worker.is_alive():
+            # The logic overran an earlier deadline and still holds its state
+            self.fallbacks += 1
+            return self.logic.fallback_move(board_bot, board)
+
+        tick = _Tick(self.logic.snapshot())
+        self._worker = threading.Thread(
+            target=self._refine,
+            args=(board_bot, board, deadline, tick),
+            name="anytime-logic",
+            daemon=True,
+        )
+        self._worker.start()
+        self._worker.join(deadline.remaining())
+        with self._lock:
+            tick.closed = True
+            if tick.moves:
+                move, state = tick.moves[-1]
+            else:
+                move, state = None, tick.state
+            if tick.done:
+                self.logic.restore(state)
+            else:
+                self.late += 1
+                tick.late = True
+                tick.restore_state = state
+        if move is not None:
+            return move
+        self.fallbacks += 1
+        return self.logic.fallback_move(board_bot, board)
+
+    def summary(self) -> str:
+        return "Anytime moves: {}, still thinking at the deadline: {}, fallback moves: {}".format(
+            self.moves, self.late, self.fallbacks
+        )
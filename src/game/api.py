@@ -1,44 +1,116 @@
+import asyncio
 import json
-from dataclasses import dataclass
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from typing import List, Optional, Tuple, Union
 
 import requests
-from colorama import Back, Fore, Style, init
-from dacite import from_dict
 from decode import decode
+from game.lazy_board import LazyBoard, loads
+from game.loader import load
 from game.models import Board, Bot
+from game.replay import ReplayRecorder
+from game.transport import PollingTransport, StreamTransport
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+def unwrap_response(resp):
+    """
+    The payload of a parsed response body, inside "data" when there is one
+    """
+    response_data = resp.get("data") if isinstance(resp, dict) else resp
+    if not response_data:
+        response_data = resp
+    return response_data
 
 
 @dataclass
 class Api:
     url: str
+    # Reuse one keep-alive connection pool for every call instead of opening
+    # a new TCP connection per request
+    pooled: bool = True
+    pool_size: int = 10
+    timeout: Optional[float] = 5.0
+    retries: int = 2
+    backoff: float = 0.1
+    # Append every raw board response to a replay recording
+    recorder: Optional[ReplayRecorder] = None
+    # Return boards as LazyBoard, built from the JSON as the logic reads them
+    lazy: bool = False
+    # Where board reads come from, GET requests unless a stream is used
+    transport: Union[PollingTransport, StreamTransport] = field(
+        default_factory=PollingTransport
+    )
+    _session: Optional[requests.Session] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def _get_url(self, endpoint: str) -> str:
         return "{}{}".format(self.url, endpoint)
 
-    def _req(self, endpoint: str, method: str, body: dict) -> Response:
-        print(
-            ">>> {} {} {}".format(
-                Style.BRIGHT + method.upper() + Style.RESET_ALL,
-                Fore.GREEN + endpoint + Style.RESET_ALL,
-                body,
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            # Only idempotent requests are retried on read errors and bad
+            # statuses, a move that reached the server must not be sent twice.
+            # Connection errors are retried for every method.
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                raise_on_status=False,
             )
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json"})
+            self._session = session
+        return self._session
+
+    def close(self):
+        self.transport.close()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _req(
+        self, endpoint: str, method: str, body: dict, headers: Optional[dict] = None
+    ) -> Response:
+        logger.debug(">>> %s %s %s", method.upper(), endpoint, body)
+        if self.pooled:
+            func = getattr(self._get_session(), method)
+        else:
+            func = getattr(requests, method)
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        res = func(
+            self._get_url(endpoint),
+            headers=headers,
+            data=json.dumps(body),
+            timeout=self.timeout,
         )
-        func = getattr(requests, method)
-        headers = {"Content-Type": "application/json"}
-        res = func(self._get_url(endpoint), headers=headers, data=json.dumps(body))
-        if res.status_code == 200:
-            print("<<< {} OK".format(res.status_code))
+        if res.status_code in (200, 304):
+            logger.debug("<<< %s OK", res.status_code)
         else:
-            print("<<< {} {}".format(res.status_code, res.text))
+            logger.info("<<< %s %s", res.status_code, res.text)
         return res
 
     def bots_get(self, bot_token: str) -> Optional[Bot]:
         response = self._req("/bots/{}".format(bot_token), "get", {})
         data, status = self._return_response_and_status(response)
         if status == 200:
-            return from_dict(Bot, data)
+            return load(Bot, data)
         return None
 
     def bots_register(
@@ -51,14 +123,14 @@ class Api:
         )
         resp, status = self._return_response_and_status(response)
         if status == 200:
-            return from_dict(Bot, resp)
+            return load(Bot, resp)
         return None
 
     def boards_list(self) -> Optional[List[Board]]:
         response = self._req("/boards", "get", {})
         resp, status = self._return_response_and_status(response)
         if status == 200:
-            return [from_dict(Board, board) for board in resp]
+            return [load(Board, board) for board in resp]
         return None
 
     def bots_join(self, bot_token: str, board_id: int) -> bool:
@@ -72,11 +144,17 @@ class Api:
         return False
 
     def boards_get(self, board_id: str) -> Optional[Board]:
-        response = self._req("/boards/{}".format(board_id), "get", {})
-        resp, status = self._return_response_and_status(response)
-        if status == 200:
-            return from_dict(Board, resp)
-        return None
+        return self.transport.get_board(self, board_id)
+
+    def boards_get_if_changed(
+        self, board_id: str, etag: Optional[str]
+    ) -> Tuple[Optional[Board], Optional[str], bool]:
+        """
+        Conditional boards_get, sends If-None-Match when we have an ETag from
+        an earlier response
+        :return: (board, etag, not_modified), board is None when not modified
+        """
+        return self.transport.get_board_if_changed(self, board_id, etag)
 
     def bots_move(self, bot_token: str, direction: str) -> Optional[Board]:
         response = self._req(
@@ -84,10 +162,7 @@ class Api:
             "post",
             {"direction": direction},
         )
-        resp, status = self._return_response_and_status(response)
-        if status == 200:
-            return from_dict(Board, resp)
-        return None
+        return self._load_board(response)
 
     def bots_recover(self, email: str, password: str) -> Optional[str]:
         try:
@@ -101,13 +176,82 @@ class Api:
         except:
             return None
 
+    def _load_board(self, response: Response) -> Optional[Board]:
+        resp, status = self._return_response_and_status(response, raw=self.lazy)
+        if status != 200:
+            return None
+        if self.lazy:
+            return LazyBoard(resp)
+        return load(Board, resp)
+
     def _return_response_and_status(
-        self, response: Response
+        self, response: Response, raw: bool = False
     ) -> Tuple[Union[dict, List], int]:
-        resp = response.json()
-
-        response_data = resp.get("data") if isinstance(resp, dict) else resp
-        if not response_data:
-            response_data = resp
+        """
+        :param raw: keep the camelCase keys of the server
+        """
+        response_data = unwrap_response(loads(response.content))
+        if (
+            self.recorder
+            and isinstance(response_data, dict)
+            and "gameObjects" in response_data
+        ):
+            self.recorder.record_board(response.content)
 
+        if raw:
+            return response_data, response.status_code
         return decode(response_data), response.status_code
+
+
+@dataclass
+class AsyncApi:
+    """
+    Asyncio front for Api. Requests run on a thread pool sized to the Api
+    connection pool, so many bots can share one event loop and one
+    keep-alive pool without blocking each other.
+    """
+
+    api: Api
+    _executor: Optional[ThreadPoolExecutor] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.api.pool_size, thread_name_prefix="api"
+            )
+        return self._executor
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+
+    async def bots_get(self, bot_token: str) -> Optional[Bot]:
+        return await self._call(self.api.bots_get, bot_token)
+
+    async def bots_register(
+        self, name: str, email: str, password: str, team: str
+    ) -> Optional[Bot]:
+        return await self._call(self.api.bots_register, name, email, password, team)
+
+    async def boards_list(self) -> Optional[List[Board]]:
+        return await self._call(self.api.boards_list)
+
+    async def bots_join(self, bot_token: str, board_id: int) -> bool:
+        return await self._call(self.api.bots_join, bot_token, board_id)
+
+    async def boards_get(self, board_id: str) -> Optional[Board]:
+        return await self._call(self.api.boards_get, board_id)
+
+    async def bots_move(self, bot_token: str, direction: str) -> Optional[Board]:
+        return await self._call(self.api.bots_move, bot_token, direction)
+
+    async def bots_recover(self, email: str, password: str) -> Optional[str]:
+        return await self._call(self.api.bots_recover, email, password)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.api.close()
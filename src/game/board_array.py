@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from game.models import Board, GameObject, Position
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TYPE_CODES = {
+    "BotGameObject": 0,
+    "BaseGameObject": 1,
+    "DiamondGameObject": 2,
+    "DiamondButtonGameObject": 3,
+    "TeleportGameObject": 4,
+}
+UNKNOWN_TYPE = -1
+
+
+@dataclass
+class BoardArrays:
+    """
+    Struct of arrays view of the game objects of a board, index i of every
+    array is game_objects[i]
+    """
+
+    objects: List[GameObject]
+    xs: "np.ndarray"
+    ys: "np.ndarray"
+    points: "np.ndarray"
+    types: "np.ndarray"
+
+    @classmethod
+    def from_board(cls, board: Board) -> "BoardArrays":
+        objects = board.game_objects or []
+        n = len(objects)
+        xs = np.empty(n, dtype=np.int64)
+        ys = np.empty(n, dtype=np.int64)
+        points = np.zeros(n, dtype=np.int64)
+        types = np.empty(n, dtype=np.int8)
+        for i, obj in enumerate(objects):
+            xs[i] = obj.position.x
+            ys[i] = obj.position.y
+            if obj.properties and obj.properties.points:
+                points[i] = obj.properties.points
+            types[i] = TYPE_CODES.get(obj.type, UNKNOWN_TYPE)
+        return cls(objects, xs, ys, points, types)
+
+    def indices_of(self, type_name: str) -> "np.ndarray":
+        return np.flatnonzero(self.types == TYPE_CODES[type_name])
+
+
+def teleporter_arrays(teleporter_pairs: Dict[str, List[GameObject]]):
+    """
+    Entry and exit coordinates of the complete teleporter pairs
+    :param teleporter_pairs: dict of pair_id to teleporters
+    :return: tuple of arrays (t1x, t1y, t2x, t2y)
+    """
+    pairs = [pair for pair in teleporter_pairs.values() if len(pair) == 2]
+    coords = np.array(
+        [
+            (t1.position.x, t1.position.y, t2.position.x, t2.position.y)
+            for t1, t2 in pairs
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 4)
+    return coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3]
+
+
+def distances_via_tp(src: Position, xs, ys, teleporter_pairs) -> "np.ndarray":
+    """
+    Batch version of Pesemka.distance_via_tp from src to every (xs, ys)
+    """
+    direct = np.abs(xs - src.x) + np.abs(ys - src.y)
+    t1x, t1y, t2x, t2y = teleporter_arrays(teleporter_pairs)
+    if len(t1x) == 0:
+        return direct
+
+    to_t1 = np.abs(t1x - src.x) + np.abs(t1y - src.y)
+    to_t2 = np.abs(t2x - src.x) + np.abs(t2y - src.y)
+    from_t2 = np.abs(t2x[None, :] - xs[:, None]) + np.abs(t2y[None, :] - ys[:, None])
+    from_t1 = np.abs(t1x[None, :] - xs[:, None]) + np.abs(t1y[None, :] - ys[:, None])
+    d1 = (to_t1[None, :] + 1 + from_t2).min(axis=1)
+    d2 = (to_t2[None, :] + 1 + from_t1).min(axis=1)
+    return np.minimum(direct, np.minimum(d1, d2))
+
+
+def best_target(
+    arrays: BoardArrays,
+    current: Position,
+    carried: int,
+    teleporter_pairs: Dict[str, List[GameObject]],
+    inventory_size: int = 5,
+    extra: Optional["np.ndarray"] = None,
+) -> Optional[GameObject]:
+    """
+    Density ranking of Pesemka.choose_optimal_target for all diamonds and
+    buttons in one batch. Ties go to the first candidate in the same order
+    as the loop version, diamonds first and then buttons.
+    :param extra: grid of extra moves to add for a target on each tile
+    :return: the best object or None when nothing can be taken
+    """
+    diamonds = arrays.indices_of("DiamondGameObject")
+    buttons = arrays.indices_of("DiamondButtonGameObject")
+    candidates = np.concatenate((diamonds, buttons))
+    if len(candidates) == 0:
+        return None
+
+    points = arrays.points[diamonds]
+    weights = np.concatenate(
+        (np.where(points == 1, 2.0, 4.0), np.ones(len(buttons)))
+    )
+    dist = distances_via_tp(
+        current, arrays.xs[candidates], arrays.ys[candidates], teleporter_pairs
+    ).astype(np.float64)
+    if extra is not None:
+        dist += extra[arrays.ys[candidates], arrays.xs[candidates]]
+    dist[: len(diamonds)][carried + points > inventory_size] = np.inf
+
+    density = dist / weights
+    best = int(np.argmin(density))
+    if density[best] == np.inf:
+        return None
+    return arrays.objects[candidates[best]]
@@ -0,0 +1,82 @@
+import marshal
+from typing import Optional
+
+from game.models import Base, Board, Config, Feature, GameObject, Position, Properties
+
+_CONFIG_FIELDS = (
+    "generation_ratio",
+    "min_ratio_for_generation",
+    "red_ratio",
+    "seconds",
+    "pairs",
+    "inventory_size",
+    "can_tackle",
+)
+_PROPERTY_FIELDS = (
+    "points",
+    "pair_id",
+    "diamonds",
+    "score",
+    "name",
+    "inventory_size",
+    "can_tackle",
+    "milliseconds_left",
+    "time_joined",
+)
+
+
+def _properties(props: Optional[Properties]):
+    if props is None:
+        return None
+    base = (props.base.x, props.base.y) if props.base else None
+    return tuple(getattr(props, name) for name in _PROPERTY_FIELDS) + (base,)
+
+
+def encode_board(board: Board) -> bytes:
+    """
+    Serialize a board as nested tuples of plain values with marshal, much
+    smaller and faster to pass between processes than pickled dataclasses
+    """
+    features = tuple(
+        (
+            f.name,
+            tuple(getattr(f.config, name) for name in _CONFIG_FIELDS) if f.config else None,
+        )
+        for f in board.features
+    )
+    objects = tuple(
+        (o.id, o.position.x, o.position.y, o.type, _properties(o.properties))
+        for o in board.game_objects or []
+    )
+    return marshal.dumps(
+        (
+            board.id,
+            board.width,
+            board.height,
+            board.minimum_delay_between_moves,
+            features,
+            objects,
+        )
+    )
+
+
+def decode_board(data: bytes) -> Board:
+    board_id, width, height, delay, features, objects = marshal.loads(data)
+    game_objects = []
+    for obj_id, x, y, type_name, props in objects:
+        properties = None
+        if props is not None:
+            *values, base = props
+            properties = Properties(*values, base=Base(base[1], base[0]) if base else None)
+        game_objects.append(GameObject(obj_id, Position(y, x), type_name, properties))
+    return Board(
+        id=board_id,
+        width=width,
+        height=height,
+        features=[
+            Feature(name, Config(*config) if config is not None else None)
+            for name, config in features
+        ],
+        minimum_delay_between_moves=delay,
+        game_objects=game_objects,
+    )
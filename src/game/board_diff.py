@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from game.models import Board, GameObject
+
+
+@dataclass
+class BoardDiff:
+    added: List[GameObject] = field(default_factory=list)
+    removed: List[GameObject] = field(default_factory=list)
+    # (previous, current) for objects whose position changed
+    moved: List[Tuple[GameObject, GameObject]] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.moved)
+
+    def touches(self, type_name: str) -> bool:
+        return (
+            any(o.type == type_name for o in self.added)
+            or any(o.type == type_name for o in self.removed)
+            or any(new.type == type_name for _, new in self.moved)
+        )
+
+
+def diff_boards(previous: Optional[Board], current: Board) -> BoardDiff:
+    """
+    Compare two snapshots of a board by GameObject.id
+    :param previous: board of the previous tick, None on the first tick
+    :param current: board of this tick
+    :return: BoardDiff
+    """
+    current_objects = current.game_objects or []
+    if previous is None:
+        return BoardDiff(added=list(current_objects))
+
+    before: Dict[int, GameObject] = {o.id: o for o in previous.game_objects or []}
+    diff = BoardDiff()
+    for obj in current_objects:
+        old = before.pop(obj.id, None)
+        if old is None:
+            diff.added.append(obj)
+        elif old.position.x != obj.position.x or old.position.y != obj.position.y:
+            diff.moved.append((old, obj))
+    diff.removed.extend(before.values())
+    return diff
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
-from typing import Union, List
-from game.api import Api
+from typing import Union, List, Optional, Tuple
+from game.api import Api, AsyncApi
 from game.models import Board
 
 @dataclass
@@ -12,3 +12,19 @@ class BoardHandler:
 
     def get_board(self, board_id: int) -> Board:
         return self.api.boards_get(board_id)
+
+    def get_board_if_changed(
+        self, board_id: int, etag: Optional[str]
+    ) -> Tuple[Optional[Board], Optional[str], bool]:
+        return self.api.boards_get_if_changed(board_id, etag)
+
+
+@dataclass
+class AsyncBoardHandler:
+    api: AsyncApi
+
+    async def list_boards(self) -> List[Board]:
+        return await self.api.boards_list()
+
+    async def get_board(self, board_id: int) -> Board:
+        return await self.api.boards_get(board_id)
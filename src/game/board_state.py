@@ -0,0 +1,78 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from game.board_handler import BoardHandler
+from game.models import Board
+
+
+@dataclass
+class BoardState:
+    """
+    Latest known board and whether it is still current. A board returned by
+    a move or a fetch is current until it is older than max_age, or until
+    invalidate marks it outdated when the caller knows the board changed.
+    get only skips the fetch while the snapshot is current. Fetches are conditional on the ETag of the last
+    response when the server sends one, a 304 keeps the snapshot.
+    """
+
+    board_handler: BoardHandler
+    board_id: int
+    max_age: float = 1.0
+    clock: Callable[[], float] = time.monotonic
+    board: Optional[Board] = field(default=None, init=False)
+    etag: Optional[str] = field(default=None, init=False)
+    updated_at: float = field(default=0.0, init=False)
+    current: bool = field(default=False, init=False)
+    fetches: int = field(default=0, init=False)
+    not_modified: int = field(default=0, init=False)
+    saved: int = field(default=0, init=False)
+
+    @property
+    def age(self) -> float:
+        if self.board is None:
+            return float("inf")
+        return self.clock() - self.updated_at
+
+    def update(self, board: Board):
+        """
+        Keep a board received with a move as the latest snapshot
+        """
+        self.board = board
+        self.updated_at = self.clock()
+        self.current = True
+
+    def invalidate(self):
+        """
+        The board may have changed since the snapshot, fetch on the next get
+        """
+        self.current = False
+
+    def fetch(self) -> Optional[Board]:
+        self.fetches += 1
+        board, etag, not_modified = self.board_handler.get_board_if_changed(
+            self.board_id, self.etag
+        )
+        if not_modified and self.board is not None:
+            self.not_modified += 1
+            self.updated_at = self.clock()
+            self.current = True
+            return self.board
+        if board is not None:
+            self.etag = etag
+            self.update(board)
+        return board
+
+    def get(self, force: bool = False) -> Optional[Board]:
+        """
+        The latest board, fetched unless the snapshot is known to be current
+        """
+        if not force and self.current and self.age < self.max_age:
+            self.saved += 1
+            return self.board
+        return self.fetch()
+
+    def summary(self) -> str:
+        return "Board fetches: {} ({} not modified), fetches skipped: {}".format(
+            self.fetches, self.not_modified, self.saved
+        )
@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional
+
+from game.board_diff import BoardDiff, diff_boards
+from game.models import Board, GameObject, Position
+from game.teleporters import TeleporterIndex
+
+TARGET_TYPES = ("DiamondGameObject", "DiamondButtonGameObject")
+
+
+def _distance(ax: int, ay: int, bx: int, by: int) -> int:
+    return abs(ax - bx) + abs(ay - by)
+
+
+class DistanceFields:
+    """
+    Distances from every diamond and button to the teleporter exits, kept
+    between ticks. Each tick the board is diffed against the previous one
+    by object id and only added or moved targets are recomputed.
+    Everything is rebuilt when the teleporter index was.
+    """
+
+    def __init__(self, teleporters: Optional[TeleporterIndex] = None):
+        self.previous: Optional[Board] = None
+        # Shared with the logic so the teleporters are only read once a tick
+        self.teleporters = teleporters or TeleporterIndex()
+        # Per target id: walking distance from every portal exit, in the
+        # order of teleporters.portals
+        self.exit_costs: Dict[int, List[int]] = {}
+        self.recomputed = 0
+        self.rebuilds = 0
+        self._builds = None
+
+    def _via_portals(self, x: int, y: int, exit_costs: List[int], direct: int) -> int:
+        best = direct
+        for (ex, ey, _, _, _), cost in zip(self.teleporters.portals, exit_costs):
+            d = _distance(x, y, ex, ey) + 1 + cost
+            if d < best:
+                best = d
+        return best
+
+    def _exit_costs(self, x: int, y: int) -> List[int]:
+        return [_distance(ox, oy, x, y) for _, _, ox, oy, _ in self.teleporters.portals]
+
+    def _compute(self, obj: GameObject):
+        self.exit_costs[obj.id] = self._exit_costs(obj.position.x, obj.position.y)
+        self.recomputed += 1
+
+    def update(self, board: Board) -> BoardDiff:
+        """
+        Bring the fields up to date with board
+        :return: the diff against the previous board
+        """
+        self.recomputed = 0
+        self.teleporters.update(board)
+        diff = diff_boards(self.previous, board)
+        full = self.previous is None or self.teleporters.builds != self._builds
+        self.previous = board
+        self._builds = self.teleporters.builds
+
+        if full:
+            self.rebuilds += 1
+            self.exit_costs.clear()
+            for type_name in TARGET_TYPES:
+                for obj in board.objects_by_type(type_name):
+                    self._compute(obj)
+            return diff
+
+        for obj in diff.removed:
+            self.exit_costs.pop(obj.id, None)
+        for obj in diff.added:
+            if obj.type in TARGET_TYPES:
+                self._compute(obj)
+        for _, obj in diff.moved:
+            if obj.type in TARGET_TYPES:
+                self._compute(obj)
+        return diff
+
+    def via_tp(self, src: Position, obj: GameObject) -> int:
+        """
+        Same value as Pesemka.distance_via_tp(src, obj.position) using the
+        cached exit distances of obj
+        """
+        x, y = obj.position.x, obj.position.y
+        direct = _distance(src.x, src.y, x, y)
+        exit_costs = self.exit_costs.get(obj.id)
+        if exit_costs is None:
+            exit_costs = self._exit_costs(x, y)
+        return self._via_portals(src.x, src.y, exit_costs, direct)
@@ -0,0 +1,129 @@
+import json
+from typing import Dict, List, Optional
+
+from decode import decode
+from game.loader import load
+from game.models import Base, Board, Bot, Feature, GameObject, Position, Properties
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes):
+    """
+    Parse JSON with orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class LazyBoard(Board):
+    """
+    Board that keeps the parsed JSON of a response with its camelCase keys
+    and only builds the GameObjects that are asked for. get_bot and
+    objects_by_type build the matching objects only, game_objects and
+    anything using the full index build them all, after which the regular
+    Board index is used. Objects are built once, the same GameObject is
+    returned for every access.
+
+    Can also be made like a Board from its fields, as dataclasses.replace
+    does, then nothing is lazy.
+    """
+
+    def __init__(self, data: Optional[dict] = None, **fields):
+        self._by_type: Dict[str, List[GameObject]] = {}
+        self._built: Dict[int, GameObject] = {}
+        if data is None:
+            self._raw_objects = None
+            self._raw_features = None
+            super().__init__(**fields)
+            return
+        self._raw_objects = data.get("gameObjects")
+        self._raw_features = data.get("features") or []
+        self._objects: Optional[List[GameObject]] = None
+        self._features: Optional[List[Feature]] = None
+        self._index = None
+        self.id = data["id"]
+        self.width = data["width"]
+        self.height = data["height"]
+        self.minimum_delay_between_moves = data["minimumDelayBetweenMoves"]
+
+    @property
+    def features(self) -> List[Feature]:
+        if self._features is None:
+            self._features = [load(Feature, decode(f)) for f in self._raw_features]
+        return self._features
+
+    @features.setter
+    def features(self, value: List[Feature]):
+        self._features = value
+
+    @property
+    def game_objects(self) -> Optional[List[GameObject]]:
+        if self._objects is None and self._raw_objects is not None:
+            self._objects = [self._object(i) for i in range(len(self._raw_objects))]
+        return self._objects
+
+    @game_objects.setter
+    def game_objects(self, value: Optional[List[GameObject]]):
+        self._objects = value
+        self._raw_objects = None
+
+    def _object(self, i: int) -> GameObject:
+        obj = self._built.get(i)
+        if obj is not None:
+            return obj
+        raw = self._raw_objects[i]
+        position = raw["position"]
+        props = raw.get("properties")
+        properties = None
+        if props is not None:
+            base = props.get("base")
+            properties = Properties(
+                points=props.get("points"),
+                pair_id=props.get("pairId"),
+                diamonds=props.get("diamonds"),
+                score=props.get("score"),
+                name=props.get("name"),
+                inventory_size=props.get("inventorySize"),
+                can_tackle=props.get("canTackle"),
+                milliseconds_left=props.get("millisecondsLeft"),
+                time_joined=props.get("timeJoined"),
+                base=Base(base["y"], base["x"]) if base is not None else None,
+            )
+        obj = self._built[i] = GameObject(
+            raw["id"], Position(position["y"], position["x"]), raw["type"], properties
+        )
+        return obj
+
+    @property
+    def built(self) -> int:
+        """
+        Number of game objects built from the JSON so far
+        """
+        return len(self._built)
+
+    def objects_by_type(self, type_name: str) -> List[GameObject]:
+        if self._objects is not None or self._raw_objects is None:
+            return super().objects_by_type(type_name)
+        objects = self._by_type.get(type_name)
+        if objects is None:
+            objects = self._by_type[type_name] = [
+                self._object(i)
+                for i, raw in enumerate(self._raw_objects)
+                if raw["type"] == type_name
+            ]
+        return objects
+
+    def get_bot(self, bot: Bot) -> Optional[GameObject]:
+        if self._objects is not None or self._raw_objects is None:
+            return super().get_bot(bot)
+        for i, raw in enumerate(self._raw_objects):
+            if raw["type"] == "BotGameObject" and (raw.get("properties") or {}).get(
+                "name"
+            ) == bot.name:
+                return self._object(i)
+        return None
@@ -0,0 +1,89 @@
+import typing
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, Dict, Type, TypeVar
+
+T = TypeVar("T")
+
+_NoneType = type(None)
+_LOADERS: Dict[type, Callable[[dict], Any]] = {}
+
+
+def _unwrap_optional(tp):
+    """
+    Split Optional[X] into (X, True), anything else into (tp, False)
+    """
+    if typing.get_origin(tp) is typing.Union:
+        args = [a for a in typing.get_args(tp) if a is not _NoneType]
+        if len(args) == 1:
+            return args[0], True
+    return tp, False
+
+
+def _compile(cls: type) -> Callable[[dict], Any]:
+    """
+    Generate the source of a loader function for a dataclass once, based on
+    its type hints, and compile it. Nested dataclasses and lists of
+    dataclasses get their own loaders. Values are not type checked.
+    """
+    hints = typing.get_type_hints(cls)
+    namespace = {"_cls": cls}
+    lines = ["def _load(data):"]
+    kwargs = []
+
+    for i, f in enumerate(f for f in fields(cls) if f.init):
+        tp, optional = _unwrap_optional(hints[f.name])
+        var = "v{}".format(i)
+
+        if f.default is not MISSING:
+            namespace["_d{}".format(i)] = f.default
+            lines.append("    {} = data.get({!r}, _d{})".format(var, f.name, i))
+        elif f.default_factory is not MISSING:
+            namespace["_f{}".format(i)] = f.default_factory
+            lines.append(
+                "    {} = data[{!r}] if {!r} in data else _f{}()".format(
+                    var, f.name, f.name, i
+                )
+            )
+        elif optional:
+            lines.append("    {} = data.get({!r})".format(var, f.name))
+        else:
+            lines.append("    {} = data[{!r}]".format(var, f.name))
+
+        convert = None
+        item_type = None
+        if typing.get_origin(tp) in (list, typing.List):
+            (item_type,) = typing.get_args(tp) or (Any,)
+        if is_dataclass(tp):
+            namespace["_l{}".format(i)] = _get_loader(tp)
+            convert = "_l{}({})".format(i, var)
+        elif item_type is not None and is_dataclass(item_type):
+            namespace["_l{}".format(i)] = _get_loader(item_type)
+            convert = "[_l{}(o) for o in {}]".format(i, var)
+
+        if convert:
+            lines.append("    if {} is not None:".format(var))
+            lines.append("        {} = {}".format(var, convert))
+        kwargs.append("{}={}".format(f.name, var))
+
+    lines.append("    return _cls({})".format(", ".join(kwargs)))
+    exec("\n".join(lines), namespace)
+    return namespace["_load"]
+
+
+def _get_loader(cls: type) -> Callable[[dict], Any]:
+    loader = _LOADERS.get(cls)
+    if loader is None:
+        loader = _LOADERS[cls] = _compile(cls)
+    return loader
+
+
+def load(cls: Type[T], data: dict) -> T:
+    """
+    Build a dataclass instance from decoded response data. Drop in
+    replacement for dacite.from_dict on the game models, the loader for
+    each class is generated on first use and reused afterwards.
+    :param cls: dataclass type
+    :param data: dict
+    :return: instance of cls
+    """
+    return _get_loader(cls)(data)
@@ -0,0 +1,118 @@
+import atexit
+import json
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+LOGGER_NAME = "game"
+DEFAULT_LEVEL = "WARNING"
+DEFAULT_FILE_LEVEL = "DEBUG"
+
+
+class JsonlHandler(logging.Handler):
+    """
+    Write records as JSON lines in batches. Meant to run behind a
+    QueueListener so that serializing and writing stay off the game loop.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._file = open(path, "a")
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = {
+                "time": record.created,
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+            }
+            # Structured fields passed with extra={"data": {...}}
+            data = getattr(record, "data", None)
+            if data is not None:
+                entry["data"] = data
+            self._buffer.append(json.dumps(entry, default=str))
+        except Exception:
+            self.handleError(record)
+            return
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        super().close()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue records as they are. QueueHandler.prepare formats the message and
+    drops the arguments on the calling thread, here the JsonlHandler formats
+    them on the listener thread instead. Arguments are read after the call
+    returns, so only log values that are not changed afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    level: str = DEFAULT_LEVEL,
+    jsonl_path: Optional[str] = None,
+    file_level: str = DEFAULT_FILE_LEVEL,
+) -> Optional[QueueListener]:
+    """
+    Configure the game loggers. The console only shows warnings and errors by
+    default, use level DEBUG to see every request. Records also go to a JSON
+    lines file when jsonl_path is given, written by a background thread, at
+    their own level. The logger passes the lowest of both levels so that
+    records below it are still dropped before they are built.
+    :return: the listener of the file sink, stopped at exit
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    console = logging.StreamHandler()
+    console.setLevel(level.upper())
+    console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console)
+    logger.setLevel(console.level)
+
+    if not jsonl_path:
+        return None
+
+    records = queue.SimpleQueue()
+    sink = JsonlHandler(jsonl_path)
+    listener = QueueListener(records, sink)
+    # Filtered before the queue, the loop never hands over dropped records
+    handler = DeferredQueueHandler(records)
+    handler.setLevel(file_level.upper())
+    logger.addHandler(handler)
+    logger.setLevel(min(console.level, handler.level))
+    listener.start()
+
+    def stop():
+        listener.stop()
+        sink.close()
+
+    atexit.register(stop)
+    return listener
@@ -0,0 +1,13 @@
+from functools import partial
+
+from game.logic.pesemka import Pesemka
+from game.logic.random import RandomLogic
+
+CONTROLLERS = {
+    "Random": RandomLogic,
+    "Pesemka" : Pesemka,
+    "RandomPath": partial(RandomLogic, pathfinding=True),
+    "PesemkaPath": partial(Pesemka, pathfinding=True),
+    "PesemkaTour": partial(Pesemka, plan_tours=True),
+    "PesemkaSafe": partial(Pesemka, avoid_threats=True),
+}
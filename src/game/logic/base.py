@@ -1,9 +1,49 @@
+import copy
 from abc import ABC
-from typing import Tuple
+from typing import Any, Iterator, Tuple
 
 from game.models import Board, GameObject
+from game.pacing import Deadline
+from game.util import get_direction
 
 
 class BaseLogic(ABC):
     def next_move(self, board_bot: GameObject, board: Board) -> Tuple[int, int]:
         raise NotImplementedError()
+
+    def refine_moves(
+        self, board_bot: GameObject, board: Board, deadline: Deadline
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Anytime version of next_move: yield a move as soon as there is one
+        and better ones while there is time left before the deadline. The
+        last move yielded before the deadline is played.
+        """
+        yield self.next_move(board_bot, board)
+
+    def snapshot(self) -> Any:
+        """
+        State that next_move changes, for restore to undo a speculative
+        move. Logics should return only their decision state, caches that
+        check themselves against the board can stay as they are. By default
+        a deep copy of the whole logic.
+        """
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, state: Any):
+        """
+        Go back to a state returned by snapshot
+        """
+        self.__dict__.update(state)
+
+    def fallback_move(self, board_bot: GameObject, board: Board) -> Tuple[int, int]:
+        """
+        Cheap move played when no move was ready in time
+        """
+        position, base = board_bot.position, board_bot.properties.base
+        if base and (position.x, position.y) != (base.x, base.y):
+            return get_direction(position.x, position.y, base.x, base.y)
+        for delta_x, delta_y in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+            if 0 <= position.x + delta_x < board.width and 0 <= position.y + delta_y < board.height:
+                return delta_x, delta_y
+        return 1, 0
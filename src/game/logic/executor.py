@@ -0,0 +1,86 @@
+import asyncio
+import itertools
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from game.board_codec import decode_board, encode_board
+from game.logic.base import BaseLogic
+from game.models import Board, Bot, GameObject
+
+# Logic instances living in a worker process, by adapter key
+_WORKER_LOGICS: Dict[int, BaseLogic] = {}
+
+
+def _worker_next_move(key: int, logic_name: str, bot_name: str, data: bytes) -> Tuple[int, int]:
+    from game.logic import CONTROLLERS
+
+    logic = _WORKER_LOGICS.get(key)
+    if logic is None:
+        logic = _WORKER_LOGICS[key] = CONTROLLERS[logic_name]()
+    board = decode_board(data)
+    board_bot = board.get_bot(Bot(name=bot_name, email="", id=""))
+    return logic.next_move(board_bot, board)
+
+
+class LogicWorkers:
+    """
+    Workers to run logics on, off the event loop. With threads every bot
+    keeps its logic in this process and the thread pool is shared. With
+    processes the logics run in parallel: every bot is pinned to one single
+    process executor for the whole game, so its logic keeps its state there,
+    and boards are sent over in the compact form of game.board_codec.
+    """
+
+    def __init__(self, workers: Optional[int] = None, processes: bool = False):
+        self.processes = processes
+        workers = workers or multiprocessing.cpu_count()
+        if processes:
+            self._executors: List[Executor] = [
+                ProcessPoolExecutor(max_workers=1) for _ in range(workers)
+            ]
+        else:
+            self._executors = [ThreadPoolExecutor(workers, thread_name_prefix="logic")]
+        self._keys = itertools.count()
+
+    def adapter(self, logic_name: str) -> "ExecutorLogic":
+        key = next(self._keys)
+        executor = self._executors[key % len(self._executors)]
+        return ExecutorLogic(logic_name, executor, key, self.processes)
+
+    def close(self):
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutorLogic(BaseLogic):
+    """
+    Logic that computes its moves on a LogicWorkers executor, made with
+    LogicWorkers.adapter
+    """
+
+    def __init__(self, logic_name: str, executor: Executor, key: int, processes: bool):
+        from game.logic import CONTROLLERS
+
+        self.logic_name = logic_name
+        self.executor = executor
+        self.key = key
+        self.processes = processes
+        self.logic: Optional[BaseLogic] = None if processes else CONTROLLERS[logic_name]()
+
+    def submit(self, board_bot: GameObject, board: Board) -> Future:
+        if self.processes:
+            return self.executor.submit(
+                _worker_next_move,
+                self.key,
+                self.logic_name,
+                board_bot.properties.name,
+                encode_board(board),
+            )
+        return self.executor.submit(self.logic.next_move, board_bot, board)
+
+    def next_move(self, board_bot: GameObject, board: Board) -> Tuple[int, int]:
+        return tuple(self.submit(board_bot, board).result())
+
+    async def next_move_async(self, board_bot: GameObject, board: Board) -> Tuple[int, int]:
+        return tuple(await asyncio.wrap_future(self.submit(board_bot, board)))
@@ -1,85 +1,113 @@
+import time
+
+from game.board_array import BoardArrays, best_target, np
+from game.distance_cache import DistanceFields
 from game.logic.base import BaseLogic
 from game.models import GameObject, Board, Position
+from game.pacing import Deadline
+from game.pathfinding import Pathfinder
+from game.planner import TourPlanner
+from game.teleporters import TeleporterIndex
+from game.threat import ThreatMap
 from game.util import *
 
+VECTORIZE_MIN_DIAMONDS = 50
+# Extra moves per point of threat and per diamond carried
+THREAT_WEIGHT = 0.1
+
 
 class Pesemka(BaseLogic):
-    def __init__(self): 
+    def __init__(
+        self,
+        vectorized=None,
+        pathfinding=False,
+        distance_cache=False,
+        plan_tours=False,
+        avoid_threats=False,
+    ):
         self.goal = None
-        self.teleporter_pairs = {}
+        # Teleporter pairs and routes, only rebuilt when a teleporter changes
+        self.teleporters = TeleporterIndex()
         self.post_tp_target = None
         self.position = Position
+        # Score all candidates in one NumPy batch, by default only on boards
+        # with enough diamonds for it to pay off and when NumPy is installed
+        self.vectorized = vectorized
+        # Walk the shortest path around bots instead of the greedy x then y
+        self.pathfinder = None
+        if pathfinding:
+            self.pathfinder = Pathfinder(teleporters=self.teleporters)
+        # Target distances kept across ticks, only changed objects recomputed.
+        # Off by default, on the boards of a game next_move is faster without
+        # it, see bench.bench_distance_cache
+        self.distance_fields = None
+        if distance_cache:
+            self.distance_fields = DistanceFields(self.teleporters)
+        # Plan several pickups ahead instead of only the next best target
+        self.planner = TourPlanner() if plan_tours else None
+        # Set while refine_moves runs, the planner may use all time up to it
+        self.deadline = None
+        # Keep the diamonds we carry away from bots that can tackle us,
+        # needs NumPy
+        self.threats = ThreatMap() if avoid_threats and np is not None else None
+        # Extra moves per point of threat this tick, 0 with nothing to lose
+        self.danger_weight = 0
+
+    def snapshot(self):
+        # The teleporter index, distance fields, threat map and path cache
+        # are checked against every board they are given
+        return self.goal, self.post_tp_target, self.danger_weight
+
+    def restore(self, state):
+        self.goal, self.post_tp_target, self.danger_weight = state
 
     def objects_by_type(self, board, type_name):
-        return [o for o in board.game_objects if o.type == type_name]
+        return board.objects_by_type(type_name)
 
     def grid_distance(self, a, b):
         return abs(a.x - b.x) + abs(a.y - b.y)
 
+    @property
+    def teleporter_pairs(self):
+        return self.teleporters.pairs
+
     def refresh_teleporters(self, board):
-        self.teleporter_pairs.clear()
-        for tp in self.objects_by_type(board, "TeleportGameObject"):
-            pid = tp.properties.pair_id
-            if pid not in self.teleporter_pairs:
-                self.teleporter_pairs[pid] = []
-            self.teleporter_pairs[pid].append(tp)
+        self.teleporters.update(board)
 
     def distance_via_tp(self, src, dst):
-        direct = self.grid_distance(src, dst)
-        if not self.teleporter_pairs:
-            return direct
-
-        best = direct
-        for pair in self.teleporter_pairs.values():
-            if len(pair) != 2:
-                continue
-            t1, t2 = pair
-            d1 = self.grid_distance(src, t1.position) + 1 + self.grid_distance(t2.position, dst)
-            d2 = self.grid_distance(src, t2.position) + 1 + self.grid_distance(t1.position, dst)
-            if d1 < best:
-                best = d1
-            if d2 < best:
-                best = d2
-        return best
+        return self.teleporters.distance(src, dst)
 
     def nearest_tp(self, src):
-        if not self.teleporter_pairs:
-            return None
-        candidate = None
-        min_dist = float('inf')
-        for pair in self.teleporter_pairs.values():
-            if len(pair) != 2:
-                continue
-            for tp in pair:
-                dist = self.grid_distance(src, tp.position)
-                if dist < min_dist:
-                    min_dist = dist
-                    candidate = tp
-        return candidate
+        return self.teleporters.nearest_entry(src)
 
-    def choose_optimal_target(self, bot, board):
-        current = bot.position
-        carried = bot.properties.diamonds   
-        base = bot.properties.base
+    def target_distance(self, current, obj):
+        if self.distance_fields:
+            dist = self.distance_fields.via_tp(current, obj)
+        else:
+            dist = self.distance_via_tp(current, obj.position)
+        if self.danger_weight:
+            dist += self.danger_weight * self.threats.at(obj.position.x, obj.position.y)
+        return dist
 
-        # Jika diamond >= 5 maka bot akan pulang
-        if carried >= 5:
-            self.refresh_teleporters(board)
-            direct_home = self.grid_distance(current, base)
-            tp_home = self.distance_via_tp(current, base)
-            if tp_home < direct_home:
-                nearest_tp = self.nearest_tp(current)
-                if nearest_tp:
-                    return nearest_tp.position
-                return base
-            return base
+    def update_threats(self, bot, board):
+        if not self.threats:
+            return
+        self.threats.update(board, bot)
+        self.danger_weight = THREAT_WEIGHT * (bot.properties.diamonds or 0)
 
-        if self.post_tp_target and position_equals(current, self.goal):
-            target = self.post_tp_target
-            self.post_tp_target = None
-            return target
+    def safer_direction(self, bot, goal):
+        """
+        Greedy step towards goal along whichever axis is less threatened
+        """
+        x, y = bot.position.x, bot.position.y
+        steps = []
+        if goal.x != x:
+            steps.append((clamp(goal.x - x, -1, 1), 0))
+        if goal.y != y:
+            steps.append((0, clamp(goal.y - y, -1, 1)))
+        return min(steps, key=lambda d: self.threats.at(x + d[0], y + d[1]))
 
-        self.refresh_teleporters(board)
+    def best_candidate(self, current, carried, board):
         candidates = []
 
         for diamond in board.diamonds:
@@ -88,11 +116,11 @@ class Pesemka(BaseLogic):
             if carried + pts > 5:
                 dist = float('inf')
             else:
-                dist = self.distance_via_tp(current, diamond.position)
+                dist = self.target_distance(current, diamond)
             candidates.append((diamond, dist, w))
 
         for btn in self.objects_by_type(board, "DiamondButtonGameObject"):
-            dist = self.distance_via_tp(current, btn.position)
+            dist = self.target_distance(current, btn)
             candidates.append((btn, dist, 1))
 
         # Mengitung density
@@ -106,44 +134,128 @@ class Pesemka(BaseLogic):
             if dens < best_density:
                 best_density = dens
                 best_obj = obj
+        return best_obj
 
-        if not best_obj:
+    def plan_tour(self, bot, board):
+        props = bot.properties
+        delay = board.minimum_delay_between_moves or 1
+        moves_left = None
+        if props.milliseconds_left is not None:
+            moves_left = props.milliseconds_left // delay
+        if self.deadline:
+            deadline = self.deadline.at
+        else:
+            # Never spend more than half a tick on planning
+            deadline = time.perf_counter() + min(self.planner.budget, delay / 1000 / 2)
+        return self.planner.plan(
+            bot.position,
+            props.diamonds,
+            props.inventory_size or 5,
+            props.base,
+            board.diamonds,
+            self.distance_via_tp,
+            moves_left,
+            deadline,
+        )
+
+    def choose_optimal_target(self, bot, board):
+        current = bot.position
+        carried = bot.properties.diamonds   
+        base = bot.properties.base
+
+        # Jika diamond >= 5 maka bot akan pulang
+        if carried >= 5:
+            self.refresh_teleporters(board)
+            direct_home = self.grid_distance(current, base)
+            tp_home = self.distance_via_tp(current, base)
+            if tp_home < direct_home:
+                nearest_tp = self.nearest_tp(current)
+                if nearest_tp:
+                    return nearest_tp.position
+                return base
             return base
 
-        direct_dist = self.grid_distance(current, best_obj.position)
-        tp_dist = self.distance_via_tp(current, best_obj.position)
-        if tp_dist < direct_dist:
-            chosen_tp = None
-            best_route = float('inf')
-            for pair in self.teleporter_pairs.values():
-                if len(pair) != 2:
-                    continue
-                t1, t2 = pair
-                d1 = self.grid_distance(current, t1.position) + 1 + self.grid_distance(t2.position, best_obj.position)
-                d2 = self.grid_distance(current, t2.position) + 1 + self.grid_distance(t1.position, best_obj.position)
-                if d1 < best_route:
-                    best_route = d1
-                    chosen_tp = t1
-                    self.post_tp_target = best_obj.position
-                if d2 < best_route:
-                    best_route = d2
-                    chosen_tp = t2
-                    self.post_tp_target = best_obj.position
-            if chosen_tp:
-                return chosen_tp.position
-            return best_obj.position
+        if self.post_tp_target and position_equals(current, self.goal):
+            target = self.post_tp_target
+            self.post_tp_target = None
+            return target
+
+        self.refresh_teleporters(board)
+        tour = self.plan_tour(bot, board) if self.planner else None
+        vectorized = self.vectorized
+        if vectorized is None:
+            vectorized = np is not None and len(board.diamonds) >= VECTORIZE_MIN_DIAMONDS
+        if tour is None and not vectorized and self.distance_fields:
+            # Only best_candidate reads the fields
+            self.distance_fields.update(board)
+        if tour is not None:
+            best_obj = tour.targets[0] if tour.targets else None
+        elif vectorized:
+            extra = None
+            if self.danger_weight:
+                extra = self.threats.grid * self.danger_weight
+            best_obj = best_target(
+                BoardArrays.from_board(board),
+                current,
+                carried,
+                self.teleporter_pairs,
+                extra=extra,
+            )
+        else:
+            best_obj = self.best_candidate(current, carried, board)
+
+        if not best_obj:
+            return base
 
+        _, chosen_tp = self.teleporters.route(current, best_obj.position)
+        if chosen_tp:
+            self.post_tp_target = best_obj.position
+            return chosen_tp.position
         return best_obj.position
 
     def next_move(self, board_bot : GameObject, board : Board):
+        self.update_threats(board_bot, board)
         self.goal = self.choose_optimal_target(board_bot, board)
         if position_equals(board_bot.position, self.goal):
             self.goal = board_bot.properties.base
 
+        if self.pathfinder:
+            if self.danger_weight:
+                direction = self.pathfinder.next_direction(
+                    board, board_bot, self.goal, self.threats.costs, self.danger_weight
+                )
+            else:
+                direction = self.pathfinder.next_direction(board, board_bot, self.goal)
+            if direction:
+                return direction
+
+        if self.danger_weight and not position_equals(board_bot.position, self.goal):
+            return self.safer_direction(board_bot, self.goal)
+
         dx, dy = get_direction(
             board_bot.position.x,
             board_bot.position.y,
             self.goal.x,
             self.goal.y
         )
-        return dx, dy
\ No newline at end of file
+        return dx, dy
+
+    def refine_moves(self, board_bot, board, deadline):
+        if not self.planner:
+            yield self.next_move(board_bot, board)
+            return
+
+        # Greedy move first, then the planned one using the time that is left
+        state = (self.goal, self.post_tp_target)
+        planner, self.planner = self.planner, None
+        try:
+            yield self.next_move(board_bot, board)
+        finally:
+            self.planner = planner
+        self.goal, self.post_tp_target = state
+        # Leave a little margin so the planned move is in before the deadline
+        self.deadline = Deadline(deadline.at - min(0.005, deadline.remaining() / 4))
+        try:
+            yield self.next_move(board_bot, board)
+        finally:
+            self.deadline = None
@@ -3,14 +3,26 @@ from typing import Optional
 
 from game.logic.base import BaseLogic
 from game.models import GameObject, Board, Position
+from game.pathfinding import Pathfinder
 from ..util import get_direction
 
 
 class RandomLogic(BaseLogic):
-    def __init__(self):
+    def __init__(self, pathfinding: bool = False):
         self.directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
         self.goal_position: Optional[Position] = None
         self.current_direction = 0
+        # Own generator, seeded from random so that seeding random before
+        # the logic is made, as main.py and replay.py do, repeats its moves
+        self.rng = random.Random(random.getrandbits(64))
+        self.pathfinder: Optional[Pathfinder] = Pathfinder() if pathfinding else None
+
+    def snapshot(self):
+        return self.goal_position, self.current_direction, self.rng.getstate()
+
+    def restore(self, state):
+        self.goal_position, self.current_direction, rng_state = state
+        self.rng.setstate(rng_state)
 
     def next_move(self, board_bot: GameObject, board: Board):
         props = board_bot.properties
@@ -24,7 +36,15 @@ class RandomLogic(BaseLogic):
             self.goal_position = None
 
         current_position = board_bot.position
-        if self.goal_position:
+        direction = None
+        if self.goal_position and self.pathfinder:
+            direction = self.pathfinder.next_direction(
+                board, board_bot, self.goal_position
+            )
+
+        if direction:
+            delta_x, delta_y = direction
+        elif self.goal_position:
             # We are aiming for a specific position, calculate delta
             delta_x, delta_y = get_direction(
                 current_position.x,
@@ -37,7 +57,7 @@ class RandomLogic(BaseLogic):
             delta = self.directions[self.current_direction]
             delta_x = delta[0]
             delta_y = delta[1]
-            if random.random() > 0.6:
+            if self.rng.random() > 0.6:
                 self.current_direction = (self.current_direction + 1) % len(
                     self.directions
                 )
@@ -0,0 +1,123 @@
+import cProfile
+import math
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict
+
+# Histogram buckets grow by 5% per bucket, fine enough for percentiles and
+# bounded in memory however long the game runs
+_BUCKET_GROWTH = math.log(1.05)
+_MIN_SECONDS = 1e-6
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        bucket = int(math.log(max(seconds, _MIN_SECONDS) / _MIN_SECONDS) / _BUCKET_GROWTH)
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-th fraction of samples
+        :param q: fraction between 0 and 1
+        :return: seconds
+        """
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= q * self.count:
+                return min(_MIN_SECONDS * math.exp((bucket + 1) * _BUCKET_GROWTH), self.max)
+        return 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.add(time.perf_counter() - self.start)
+        return False
+
+
+class PhaseStats:
+    """
+    Latency histograms per phase of the game loop. When disabled, phase()
+    returns one shared no-op context manager so the loop pays next to
+    nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[str, Histogram] = {}
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _DISABLED
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return _Timer(histogram)
+
+    def summary(self) -> str:
+        lines = ["{:8} {:>7} {:>9} {:>9} {:>9} {:>9}".format(
+            "phase", "count", "mean ms", "p50 ms", "p95 ms", "p99 ms"
+        )]
+        for name, h in self.histograms.items():
+            lines.append(
+                "{:8} {:7} {:9.2f} {:9.2f} {:9.2f} {:9.2f}".format(
+                    name,
+                    h.count,
+                    h.mean * 1000,
+                    h.percentile(0.5) * 1000,
+                    h.percentile(0.95) * 1000,
+                    h.percentile(0.99) * 1000,
+                )
+            )
+        return "\n".join(lines)
+
+
+def profile_logic(logic, every: int = 1) -> cProfile.Profile:
+    """
+    Profile next_move of a logic instance with cProfile. With every > 1 only
+    every n-th call is profiled, which keeps the overhead down on long games.
+    :return: the profiler, e.g. call dump_stats(path) at the end of the game
+    """
+    profiler = cProfile.Profile()
+    next_move = logic.next_move
+    calls = 0
+
+    def profiled_next_move(board_bot, board):
+        nonlocal calls
+        calls += 1
+        if calls % every:
+            return next_move(board_bot, board)
+        profiler.enable()
+        try:
+            return next_move(board_bot, board)
+        finally:
+            profiler.disable()
+
+    logic.next_move = profiled_next_move
+    return profiler
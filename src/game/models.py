@@ -1,6 +1,8 @@
-from dataclasses import dataclass
-from typing import List, Optional, Union
-from colorama import Fore, Style
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -10,17 +12,17 @@ class Bot:
     id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     y: int
     x: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Base(Position): ...
 
 
-@dataclass
+@dataclass(slots=True)
 class Properties:
     points: Optional[int] = None
     pair_id: Optional[str] = None
@@ -34,7 +36,7 @@ class Properties:
     base: Optional[Base] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GameObject:
     id: int
     position: Position
@@ -67,50 +69,77 @@ class Board:
     features: List[Feature]
     minimum_delay_between_moves: int
     game_objects: Optional[List[GameObject]]
+    _index: Optional["BoardIndex"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def index(self) -> "BoardIndex":
+        # Built once on first use, the game objects of a board don't change
+        if self._index is None:
+            self._index = BoardIndex.build(self.game_objects or [])
+        return self._index
+
+    def invalidate(self):
+        """
+        Drop the index after game_objects has been changed in place
+        """
+        self._index = None
 
     @property
     def bots(self) -> List[GameObject]:
-        return [d for d in self.game_objects if d.type == "BotGameObject"]
+        return self.objects_by_type("BotGameObject")
 
     @property
     def diamonds(self) -> List[GameObject]:
-        return [d for d in self.game_objects if d.type == "DiamondGameObject"]
+        return self.objects_by_type("DiamondGameObject")
+
+    def objects_by_type(self, type_name: str) -> List[GameObject]:
+        return self.index.by_type.get(type_name, [])
+
+    def objects_at(self, x: int, y: int) -> List[GameObject]:
+        return self.index.by_position.get((x, y), [])
 
     def get_bot(self, bot: Bot) -> Optional[GameObject]:
-        for b in self.bots:
-            if b.properties.name == bot.name:
-                return b
-        return None
+        return self.index.bots_by_name.get(bot.name)
 
     def is_valid_move(
         self, current_position: Position, delta_x: int, delta_y: int
     ) -> bool:
         if not (-1 <= delta_x <= 1) or not (-1 <= delta_y <= 1):
-            print(
-                Fore.RED + Style.BRIGHT + "Invalid move:" + Style.RESET_ALL,
-                "Delta values must be between -1 and 1 inclusive",
-            )
+            logger.debug("Invalid move: Delta values must be between -1 and 1 inclusive")
             return False
 
         if delta_x == delta_y:
-            print(
-                Fore.RED + Style.BRIGHT + "Invalid move:" + Style.RESET_ALL,
-                "Delta_x and delta_y cannot be equal",
-            )
+            logger.debug("Invalid move: Delta_x and delta_y cannot be equal")
             return False
 
         if not (0 <= current_position.x + delta_x < self.width):
-            print(
-                Fore.RED + Style.BRIGHT + "Invalid move:" + Style.RESET_ALL,
-                "X-coordinate out of bounds",
-            )
+            logger.debug("Invalid move: X-coordinate out of bounds")
             return False
 
         if not (0 <= current_position.y + delta_y < self.height):
-            print(
-                Fore.RED + Style.BRIGHT + "Invalid move:" + Style.RESET_ALL,
-                "Y-coordinate out of bounds",
-            )
+            logger.debug("Invalid move: Y-coordinate out of bounds")
             return False
 
         return True
+
+
+@dataclass
+class BoardIndex:
+    by_type: Dict[str, List[GameObject]]
+    by_position: Dict[Tuple[int, int], List[GameObject]]
+    bots_by_name: Dict[str, GameObject]
+
+    @classmethod
+    def build(cls, game_objects: List[GameObject]) -> "BoardIndex":
+        by_type = {}
+        by_position = {}
+        bots_by_name = {}
+        for obj in game_objects:
+            by_type.setdefault(obj.type, []).append(obj)
+            by_position.setdefault((obj.position.x, obj.position.y), []).append(obj)
+            if obj.type == "BotGameObject" and obj.properties:
+                # Same as scanning the bots in order, the first one wins
+                bots_by_name.setdefault(obj.properties.name, obj)
+        return cls(by_type, by_position, bots_by_name)
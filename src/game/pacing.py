@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+
+class TickScheduler:
+    """
+    Deadline based pacing of the game loop. Every tick is due one interval
+    after the previous one, the time spent on HTTP and logic during the tick
+    is taken off the wait instead of being added to it.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.interval = interval
+        self.clock = clock
+        self.sleep = sleep
+        self.drifts: List[float] = []
+        self._deadline: Optional[float] = None
+
+    @classmethod
+    def for_board(cls, minimum_delay_between_moves: int, time_factor: float = 1):
+        return cls(minimum_delay_between_moves / 1000 * time_factor)
+
+    def start(self):
+        self._deadline = self.clock()
+
+    def remaining(self) -> float:
+        """
+        Seconds left until the next tick is due
+        :return: float
+        """
+        if self._deadline is None:
+            self.start()
+        return self._deadline + self.interval - self.clock()
+
+    def _tick(self) -> float:
+        target = self._deadline + self.interval
+        woke = self.clock()
+        drift = woke - target
+        self.drifts.append(drift)
+        # Never try to catch up on a tick we overran, the next move would come
+        # sooner than the board allows and get rejected
+        self._deadline = max(target, woke)
+        return drift
+
+    def wait(self) -> float:
+        """
+        Sleep until the next tick is due
+        :return: drift of the tick from its target in seconds
+        """
+        remaining = self.remaining()
+        if remaining > 0:
+            self.sleep(remaining)
+        return self._tick()
+
+    async def wait_async(self) -> float:
+        remaining = self.remaining()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return self._tick()
+
+    @property
+    def mean_drift(self) -> float:
+        if not self.drifts:
+            return 0.0
+        return sum(self.drifts) / len(self.drifts)
+
+    @property
+    def max_drift(self) -> float:
+        return max(self.drifts, default=0.0)
+
+
+class Deadline:
+    """
+    Point in time a decision has to be ready by, on the time.perf_counter()
+    clock
+    """
+
+    def __init__(self, at: float):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.perf_counter() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.perf_counter())
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.at
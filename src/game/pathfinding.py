@@ -0,0 +1,181 @@
+import heapq
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from game.models import Board, GameObject, Position
+from game.teleporters import TeleporterIndex
+
+Tile = Tuple[int, int]
+
+
+def _manhattan(a: Tile, b: Tile) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class Pathfinder:
+    """
+    A* over the board grid. Stepping onto a teleporter lands on its partner
+    in the same move, so teleporters are edges and never taken by accident.
+    Tiles occupied by other bots cost occupied_cost extra moves, or are
+    blocked when occupied_cost is None. Tiles in danger cost their value
+    times danger_weight extra moves.
+
+    The last path is kept and reused on the next ticks as long as the goal,
+    the teleporters and the occupied tiles are the same and we are still on
+    the path.
+    """
+
+    def __init__(
+        self,
+        occupied_cost: Optional[int] = 4,
+        teleporters: Optional[TeleporterIndex] = None,
+    ):
+        self.occupied_cost = occupied_cost
+        # Shared with the logic so the teleporters are only read once a tick
+        self.teleporters = teleporters or TeleporterIndex()
+        self.hits = 0
+        self.misses = 0
+        self._key = None
+        # Tiles we stand on after each step and the tiles stepped onto
+        self._states: List[Tile] = []
+        self._steps: List[Tile] = []
+
+    def _occupied(self, board: Board, board_bot: Optional[GameObject]) -> FrozenSet[Tile]:
+        own_id = board_bot.id if board_bot else None
+        return frozenset(
+            (b.position.x, b.position.y) for b in board.bots if b.id != own_id
+        )
+
+    def _search(
+        self,
+        board: Board,
+        start: Tile,
+        goal: Tile,
+        links: Dict[Tile, Tile],
+        occupied: FrozenSet[Tile],
+        danger: Optional[Dict[Tile, int]] = None,
+        danger_weight: float = 1,
+    ) -> Optional[Tuple[List[Tile], List[Tile]]]:
+        # Lower bound through any teleporter: reach the nearest entry, then
+        # walk from the exit closest to the goal
+        exit_to_goal = min((_manhattan(t, goal) for t in links.values()), default=None)
+
+        def heuristic(tile: Tile) -> int:
+            direct = _manhattan(tile, goal)
+            if exit_to_goal is None:
+                return direct
+            via = min(_manhattan(tile, t) for t in links) + exit_to_goal
+            return min(direct, via)
+
+        # Stepping onto the goal ends the path even when it is a teleporter,
+        # so the goal gets its own node instead of its landing tile
+        reached = (-1, -1)
+        width, height = board.width, board.height
+        best = {start: 0}
+        parents: Dict[Tile, Tuple[Tile, Tile]] = {}
+        queue = [(heuristic(start), 0, start)]
+        while queue:
+            _, cost, tile = heapq.heappop(queue)
+            if tile == reached:
+                tile, step = parents[reached]
+                steps, states = [step], [links.get(step, step)]
+                while tile != start:
+                    prev, raw = parents[tile]
+                    steps.append(raw)
+                    states.append(tile)
+                    tile = prev
+                return states[::-1], steps[::-1]
+            if cost > best.get(tile, cost):
+                continue
+            x, y = tile
+            for step in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if not (0 <= step[0] < width and 0 <= step[1] < height):
+                    continue
+                step_cost = cost + 1
+                if step in occupied:
+                    if self.occupied_cost is None:
+                        continue
+                    step_cost += self.occupied_cost
+                if danger and step in danger:
+                    step_cost += danger[step] * danger_weight
+
+                landing = reached if step == goal else links.get(step, step)
+                if step_cost < best.get(landing, step_cost + 1):
+                    best[landing] = step_cost
+                    parents[landing] = (tile, step)
+                    estimate = 0 if landing == reached else heuristic(landing)
+                    heapq.heappush(queue, (step_cost + estimate, step_cost, landing))
+        return None
+
+    def find_path(
+        self,
+        board: Board,
+        start: Position,
+        goal: Position,
+        board_bot: Optional[GameObject] = None,
+        danger: Optional[Dict[Tile, int]] = None,
+        danger_weight: float = 1,
+    ) -> Optional[List[Tile]]:
+        """
+        Tiles to step onto to get from start to goal, ignoring board_bot
+        itself as an obstacle
+        :param danger: extra cost per tile, such as ThreatMap.costs
+        :return: list of tiles, empty when already there, None without a path
+        """
+        start_tile, goal_tile = (start.x, start.y), (goal.x, goal.y)
+        if start_tile == goal_tile:
+            return []
+
+        self.teleporters.update(board)
+        links = self.teleporters.links
+        occupied = self._occupied(board, board_bot)
+        key = (
+            goal_tile,
+            self.teleporters.builds,
+            occupied,
+            board.width,
+            board.height,
+            danger,
+            danger_weight,
+        )
+
+        if key == self._key and start_tile in self._states:
+            self.hits += 1
+            i = self._states.index(start_tile)
+            self._states = self._states[i:]
+            self._steps = self._steps[i:]
+            return self._steps[1:]
+
+        self.misses += 1
+        found = self._search(
+            board, start_tile, goal_tile, links, occupied, danger, danger_weight
+        )
+        if found is None:
+            self._key = None
+            return None
+        self._key = key
+        self._states, self._steps = found
+        # The first state is where we stand after the first step, keep the
+        # start as well so that the path is found again on the next tick
+        self._states = [start_tile] + self._states
+        self._steps = [None] + self._steps
+        return self._steps[1:]
+
+    def next_direction(
+        self,
+        board: Board,
+        board_bot: GameObject,
+        goal: Position,
+        danger: Optional[Dict[Tile, int]] = None,
+        danger_weight: float = 1,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        First move along the shortest path to goal
+        :return: (dx, dy) or None when there is no path or we are there
+        """
+        path = self.find_path(
+            board, board_bot.position, goal, board_bot, danger, danger_weight
+        )
+        if not path:
+            return None
+        x, y = path[0]
+        return x - board_bot.position.x, y - board_bot.position.y
@@ -0,0 +1,170 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Optional, Tuple
+
+from game.bot_handler import BotHandler
+from game.logic.base import BaseLogic
+from game.models import Board, Bot, GameObject, Position
+
+
+# Other bots further than this many moves from ours are left out of the
+# board signature, the threat map looks two moves ahead
+NEAR = 3
+
+
+def board_signature(board: Board, bot: Bot) -> tuple:
+    """
+    What the next move of bot depends on: our bot, the diamonds and every
+    other object that is not a bot, and only the bots near ours. Bots far
+    away move every tick and predict_board leaves them where they were, so
+    with them no prediction would ever match. Clocks are left out too.
+    """
+    me = board.get_bot(bot)
+    if me is None:
+        return ()
+    x, y = me.position.x, me.position.y
+    return tuple(
+        sorted(
+            (
+                o.id,
+                o.type,
+                o.position.x,
+                o.position.y,
+                o.properties.diamonds if o.properties else None,
+                o.properties.points if o.properties else None,
+            )
+            for o in board.game_objects or []
+            if o.type != "BotGameObject"
+            or abs(o.position.x - x) + abs(o.position.y - y) <= NEAR
+        )
+    )
+
+
+def predict_board(
+    board: Board, board_bot: GameObject, delta_x: int, delta_y: int
+) -> Optional[Board]:
+    """
+    The board we expect back after our move, assuming nobody else moves,
+    board_signature leaves out the bots for which that is not good enough.
+    Unchanged objects are shared with the given board.
+    :return: the predicted board, None for moves we don't predict (tackles
+    and the red button)
+    """
+    x, y = board_bot.position.x + delta_x, board_bot.position.y + delta_y
+    objects = [o for o in board.game_objects or [] if o.id != board_bot.id]
+    here = board.objects_at(x, y)
+    if any(o.type in ("BotGameObject", "DiamondButtonGameObject") for o in here):
+        return None
+
+    teleporter = next((o for o in here if o.type == "TeleportGameObject"), None)
+    if teleporter:
+        for other in board.objects_by_type("TeleportGameObject"):
+            if other.id != teleporter.id and other.properties.pair_id == teleporter.properties.pair_id:
+                x, y = other.position.x, other.position.y
+                break
+
+    props = replace(board_bot.properties)
+    props.milliseconds_left = (props.milliseconds_left or 0) - board.minimum_delay_between_moves
+    for diamond in board.objects_at(x, y):
+        if diamond.type != "DiamondGameObject":
+            continue
+        if props.diamonds + diamond.properties.points <= props.inventory_size:
+            props.diamonds += diamond.properties.points
+            objects.remove(diamond)
+    if props.base and (props.base.x, props.base.y) == (x, y):
+        props.score = (props.score or 0) + props.diamonds
+        props.diamonds = 0
+
+    objects.append(replace(board_bot, position=Position(y, x), properties=props))
+    return replace(board, game_objects=objects)
+
+
+class MovePipeline:
+    """
+    Overlap the move request with the logic: while a move is in flight the
+    next move is computed from the predicted board. The logic state is kept
+    with snapshot first, when the board that comes back matches the
+    prediction the move is used, otherwise the logic is restored and the
+    move is computed again from the real board.
+    """
+
+    def __init__(self, bot_handler: BotHandler, logic: BaseLogic, bot: Bot, board_id: int):
+        self.bot_handler = bot_handler
+        self.logic = logic
+        self.bot = bot
+        self.board_id = board_id
+        self.hits = 0
+        # Moves whose board didn't match the prediction, and moves that
+        # weren't predicted at all
+        self.misses = 0
+        self.unpredicted = 0
+        self.saved = 0.0
+        # Time spent on snapshot and restore, not part of saved
+        self.overhead = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="move")
+
+    def move(
+        self, board: Board, board_bot: GameObject, delta_x: int, delta_y: int
+    ) -> Tuple[Optional[Board], Optional[Tuple[int, int]]]:
+        """
+        Send a move and speculate on the next one
+        :return: (board returned by the move, next move or None on a miss)
+        """
+        future = self._executor.submit(
+            self.bot_handler.move, self.bot.id, self.board_id, delta_x, delta_y
+        )
+
+        speculation = None
+        predicted = predict_board(board, board_bot, delta_x, delta_y)
+        if predicted is not None:
+            predicted_bot = predicted.get_bot(self.bot)
+            start = time.perf_counter()
+            state = self.logic.snapshot()
+            snapshotted = time.perf_counter()
+            next_move = self.logic.next_move(predicted_bot, predicted)
+            self.overhead += snapshotted - start
+            speculation = (predicted, state, next_move, time.perf_counter() - snapshotted)
+
+        new_board = future.result()
+        if speculation is None:
+            self.unpredicted += 1
+            return new_board, None
+
+        predicted, state, next_move, spent = speculation
+        if new_board is None or board_signature(predicted, self.bot) != board_signature(
+            new_board, self.bot
+        ):
+            self.misses += 1
+            start = time.perf_counter()
+            self.logic.restore(state)
+            self.overhead += time.perf_counter() - start
+            return new_board, None
+
+        self.hits += 1
+        self.saved += spent
+        return new_board, next_move
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of all moves whose next move came from the speculation
+        """
+        total = self.hits + self.misses + self.unpredicted
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            "Pipelined moves: {:.0%} hit rate, {} hits, {} mispredicted, {} not predicted, "
+            "{:.1f} ms of logic hidden behind requests, {:.1f} ms on logic snapshots".format(
+                self.hit_rate,
+                self.hits,
+                self.misses,
+                self.unpredicted,
+                self.saved * 1000,
+                self.overhead * 1000,
+            )
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
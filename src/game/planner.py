@@ -0,0 +1,115 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game.models import GameObject, Position
+
+
+@dataclass
+class Tour:
+    targets: List[GameObject]
+    # Points brought home, including the ones already carried
+    points: int
+    # Moves until we are back on the base
+    moves: int
+
+    @property
+    def rate(self) -> float:
+        return self.points / max(self.moves, 1)
+
+
+class TourPlanner:
+    """
+    Plan a sequence of pickups among the nearest k diamonds that fits in the
+    inventory, ending at the base. Beam search over partial tours ranked by
+    points per move, where a partial tour is dropped when another one reached
+    the same diamond with the same pickups in fewer moves. Pairwise distances
+    are memoized for the tick. The search stops at the deadline and returns
+    the best complete tour found so far.
+    """
+
+    def __init__(self, k: int = 8, beam_width: int = 32, budget: float = 0.02):
+        self.k = k
+        self.beam_width = beam_width
+        self.budget = budget
+        self.expanded = 0
+        self.timeouts = 0
+
+    def plan(
+        self,
+        current: Position,
+        carried: int,
+        inventory_size: int,
+        base: Position,
+        diamonds: List[GameObject],
+        distance: Callable[[Position, Position], int],
+        moves_left: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[Tour]:
+        """
+        :param distance: moves between two positions, teleporters included
+        :param moves_left: moves until the bot runs out of time
+        :param deadline: time.perf_counter() value to stop searching at,
+        defaults to the planner budget from now
+        :return: the best tour, with no targets when going home is best, or
+        None when there is nothing worth doing
+        """
+        if deadline is None:
+            deadline = time.perf_counter() + self.budget
+        room = inventory_size - carried
+        candidates = sorted(
+            (d for d in diamonds if d.properties.points <= room),
+            key=lambda d: distance(current, d.position),
+        )[: self.k]
+        points = [d.properties.points for d in candidates]
+        # Node i is candidate i, the current position and the base come last
+        positions = [d.position for d in candidates] + [current, base]
+        start, home = len(candidates), len(candidates) + 1
+
+        memo: Dict[Tuple[int, int], int] = {}
+
+        def dist(a: int, b: int) -> int:
+            value = memo.get((a, b))
+            if value is None:
+                value = memo[(a, b)] = distance(positions[a], positions[b])
+            return value
+
+        best = None
+        if carried:
+            moves = dist(start, home)
+            if moves_left is None or moves <= moves_left:
+                best = Tour([], carried, moves)
+
+        # (node, picked bitmask, carried, moves so far, points picked, path)
+        beam = [(start, 0, carried, 0, 0, ())]
+        fewest_moves: Dict[Tuple[int, int], int] = {}
+        self.expanded = 0
+        while beam:
+            expansions = []
+            for node, picked, load, moves, gained, path in beam:
+                for i, pts in enumerate(points):
+                    bit = 1 << i
+                    if picked & bit or load + pts > inventory_size:
+                        continue
+                    reached = moves + dist(node, i)
+                    key = (i, picked | bit)
+                    if fewest_moves.get(key, reached + 1) <= reached:
+                        continue
+                    fewest_moves[key] = reached
+                    total = reached + dist(i, home)
+                    if moves_left is not None and total > moves_left:
+                        continue
+                    self.expanded += 1
+                    delivered = carried + gained + pts
+                    rate = delivered / max(total, 1)
+                    expansions.append(
+                        (rate, (i, picked | bit, load + pts, reached, gained + pts, path + (i,)))
+                    )
+                    if best is None or rate > best.rate:
+                        best = Tour([candidates[j] for j in path + (i,)], delivered, total)
+                if time.perf_counter() >= deadline:
+                    self.timeouts += 1
+                    return best
+            expansions.sort(key=lambda e: -e[0])
+            beam = [tour for _, tour in expansions[: self.beam_width]]
+        return best
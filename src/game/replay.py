@@ -0,0 +1,77 @@
+import json
+import mmap
+import struct
+import time
+import zlib
+from typing import Iterator, Tuple
+
+MAGIC = b"DIAMONDS-REPLAY1\n"
+
+# Record kinds
+META = 0
+BOARD = 1
+MOVE = 2
+
+# kind, unix time, length of the compressed payload
+_HEADER = struct.Struct("<BdI")
+
+
+class ReplayRecorder:
+    """
+    Append-only recording of a game. Every record is a small header and a
+    zlib compressed payload: the raw board responses as received from the
+    server, and the moves chosen for them with the time the logic took.
+    """
+
+    def __init__(self, path: str, level: int = 6):
+        self.path = path
+        self.level = level
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def _write(self, kind: int, payload: bytes):
+        data = zlib.compress(payload, self.level)
+        self._file.write(_HEADER.pack(kind, time.time(), len(data)))
+        self._file.write(data)
+
+    def record_meta(self, **meta):
+        self._write(META, json.dumps(meta).encode())
+
+    def record_board(self, raw: bytes):
+        self._write(BOARD, raw)
+
+    def record_move(self, delta_x: int, delta_y: int, logic_seconds: float):
+        self._write(
+            MOVE,
+            json.dumps({"dx": delta_x, "dy": delta_y, "logic_ms": logic_seconds * 1000}).encode(),
+        )
+        # A move closes a tick, make sure it is on disk if we crash later
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_records(path: str) -> Iterator[Tuple[int, float, bytes]]:
+    """
+    Stream the records of a recording through a memory map, the file is
+    never read into memory as a whole
+    :return: iterator of (kind, unix time, payload)
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[: len(MAGIC)] != MAGIC:
+                raise ValueError("{} is not a replay recording".format(path))
+            offset = len(MAGIC)
+            end = len(data)
+            while offset + _HEADER.size <= end:
+                kind, timestamp, length = _HEADER.unpack_from(data, offset)
+                offset += _HEADER.size
+                if offset + length > end:
+                    # Last record was cut off while writing
+                    break
+                yield kind, timestamp, zlib.decompress(data[offset : offset + length])
+                offset += length
@@ -0,0 +1,336 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from game.logic.base import BaseLogic
+from game.models import Base, Board, Config, Feature, GameObject, Position, Properties
+
+DEFAULT_CONFIG = Config(
+    generation_ratio=0.1,
+    min_ratio_for_generation=0.01,
+    red_ratio=0.2,
+    seconds=60,
+    pairs=1,
+    inventory_size=5,
+    can_tackle=True,
+)
+# Simulated time of step 0, boards don't depend on the wall clock
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class SimBot:
+    name: str
+    logic: BaseLogic
+    id: int
+    base_id: int
+    base: Tuple[int, int]
+    x: int
+    y: int
+    milliseconds_left: int
+    time_joined: str
+    diamonds: int = 0
+    score: int = 0
+    moves: int = 0
+    invalid_moves: int = 0
+    tackles: int = 0
+
+
+@dataclass
+class SimObject:
+    id: int
+    x: int
+    y: int
+    points: Optional[int] = None
+    pair_id: Optional[str] = None
+
+
+@dataclass
+class Simulator:
+    """
+    Headless, seedable version of the game server. Boards are built as
+    game.models objects, so any BaseLogic can play without network or
+    sleeps. Every step lets each bot that is still playing make one move
+    in the order they joined.
+
+    Rules follow the server: diamonds (red ones are worth 2) are picked up
+    while the inventory has room, stepping on the red button regenerates all
+    diamonds, teleporters move the bot to their partner, the base turns the
+    carried diamonds into score and moving onto another bot tackles it back
+    to its base and takes its diamonds. A bot leaves the board when its time
+    is up.
+
+    Time is simulated, every step takes minimum_delay_between_moves from
+    start_time, so the same seed always gives the same boards.
+    """
+
+    width: int = 15
+    height: int = 15
+    config: Config = field(default_factory=lambda: DEFAULT_CONFIG)
+    minimum_delay_between_moves: int = 100
+    seed: Optional[int] = None
+    board_id: int = 1
+    start_time: datetime = EPOCH
+    bots: List[SimBot] = field(default_factory=list, init=False)
+    finished: List[SimBot] = field(default_factory=list, init=False)
+    diamonds: Dict[Tuple[int, int], SimObject] = field(default_factory=dict, init=False)
+    teleporters: List[SimObject] = field(default_factory=list, init=False)
+    button: Optional[SimObject] = field(default=None, init=False)
+    steps: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        self._next_id = 1
+        for i in range(self._config("pairs")):
+            for _ in range(2):
+                x, y = self._free_tile()
+                self.teleporters.append(SimObject(self._new_id(), x, y, pair_id=str(i)))
+        x, y = self._free_tile()
+        self.button = SimObject(self._new_id(), x, y)
+        self.generate_diamonds()
+
+    def _config(self, name: str):
+        value = getattr(self.config, name)
+        return getattr(DEFAULT_CONFIG, name) if value is None else value
+
+    def now(self) -> datetime:
+        """
+        Simulated time of the current step
+        """
+        return self.start_time + timedelta(
+            milliseconds=self.steps * self.minimum_delay_between_moves
+        )
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _occupied(self) -> set:
+        taken = {(o.x, o.y) for o in self.teleporters}
+        taken.update(self.diamonds)
+        taken.update(b.base for b in self.bots)
+        taken.update((b.x, b.y) for b in self.bots)
+        if self.button:
+            taken.add((self.button.x, self.button.y))
+        return taken
+
+    def _free_tile(self) -> Tuple[int, int]:
+        taken = self._occupied()
+        if len(taken) >= self.width * self.height:
+            raise ValueError("No free tile left on the board")
+        while True:
+            tile = (self.rng.randrange(self.width), self.rng.randrange(self.height))
+            if tile not in taken:
+                return tile
+
+    def generate_diamonds(self):
+        """
+        Replace all diamonds with a new random set
+        """
+        self.diamonds.clear()
+        count = max(1, int(self.width * self.height * self._config("generation_ratio")))
+        red_ratio = self._config("red_ratio")
+        for _ in range(count):
+            x, y = self._free_tile()
+            points = 2 if self.rng.random() < red_ratio else 1
+            self.diamonds[(x, y)] = SimObject(self._new_id(), x, y, points=points)
+
+    def add_bot(self, name: str, logic: BaseLogic) -> SimBot:
+        x, y = self._free_tile()
+        base_id = self._new_id()
+        bot = SimBot(
+            name=name,
+            logic=logic,
+            id=self._new_id(),
+            base_id=base_id,
+            base=(x, y),
+            x=x,
+            y=y,
+            milliseconds_left=self._config("seconds") * 1000,
+            time_joined=self.now().isoformat(),
+        )
+        self.bots.append(bot)
+        return bot
+
+    def _features(self) -> List[Feature]:
+        return [
+            Feature("DiamondButtonProvider"),
+            Feature(
+                "DiamondProvider",
+                Config(
+                    generation_ratio=self._config("generation_ratio"),
+                    min_ratio_for_generation=self._config("min_ratio_for_generation"),
+                    red_ratio=self._config("red_ratio"),
+                ),
+            ),
+            Feature("TeleportProvider", Config(pairs=self._config("pairs"))),
+            Feature(
+                "BotProvider",
+                Config(
+                    inventory_size=self._config("inventory_size"),
+                    can_tackle=self._config("can_tackle"),
+                ),
+            ),
+            Feature("SessionProvider", Config(seconds=self._config("seconds"))),
+        ]
+
+    def board(self) -> Board:
+        """
+        Snapshot of the current state, built from new objects every time
+        like a board response of the server
+        """
+        inventory_size = self._config("inventory_size")
+        can_tackle = self._config("can_tackle")
+        objects = []
+        for bot in self.bots:
+            bx, by = bot.base
+            objects.append(
+                GameObject(
+                    bot.base_id,
+                    Position(by, bx),
+                    "BaseGameObject",
+                    Properties(name=bot.name),
+                )
+            )
+            objects.append(
+                GameObject(
+                    bot.id,
+                    Position(bot.y, bot.x),
+                    "BotGameObject",
+                    Properties(
+                        diamonds=bot.diamonds,
+                        score=bot.score,
+                        name=bot.name,
+                        inventory_size=inventory_size,
+                        can_tackle=can_tackle,
+                        milliseconds_left=bot.milliseconds_left,
+                        time_joined=bot.time_joined,
+                        base=Base(by, bx),
+                    ),
+                )
+            )
+        for tp in self.teleporters:
+            objects.append(
+                GameObject(
+                    tp.id,
+                    Position(tp.y, tp.x),
+                    "TeleportGameObject",
+                    Properties(pair_id=tp.pair_id),
+                )
+            )
+        for diamond in self.diamonds.values():
+            objects.append(
+                GameObject(
+                    diamond.id,
+                    Position(diamond.y, diamond.x),
+                    "DiamondGameObject",
+                    Properties(points=diamond.points),
+                )
+            )
+        if self.button:
+            objects.append(
+                GameObject(
+                    self.button.id,
+                    Position(self.button.y, self.button.x),
+                    "DiamondButtonGameObject",
+                    Properties(),
+                )
+            )
+        return Board(
+            id=self.board_id,
+            width=self.width,
+            height=self.height,
+            features=self._features(),
+            minimum_delay_between_moves=self.minimum_delay_between_moves,
+            game_objects=objects,
+        )
+
+    def _bot_at(self, x: int, y: int) -> Optional[SimBot]:
+        for bot in self.bots:
+            if bot.x == x and bot.y == y:
+                return bot
+        return None
+
+    def _teleport(self, x: int, y: int) -> Tuple[int, int]:
+        for tp in self.teleporters:
+            if tp.x == x and tp.y == y:
+                for other in self.teleporters:
+                    if other.pair_id == tp.pair_id and other is not tp:
+                        return other.x, other.y
+        return x, y
+
+    def move(self, bot: SimBot, delta_x: int, delta_y: int) -> bool:
+        """
+        Apply one move of bot, invalid moves are ignored like on the server
+        :return: True when the move was valid
+        """
+        bot.milliseconds_left -= self.minimum_delay_between_moves
+        if abs(delta_x) + abs(delta_y) != 1:
+            bot.invalid_moves += 1
+            return False
+        x, y = bot.x + delta_x, bot.y + delta_y
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            bot.invalid_moves += 1
+            return False
+
+        other = self._bot_at(x, y)
+        if other:
+            if not self._config("can_tackle"):
+                bot.invalid_moves += 1
+                return False
+            # Tackled bots go home and lose what they carry to the tackler
+            room = self._config("inventory_size") - bot.diamonds
+            bot.diamonds += min(room, other.diamonds)
+            other.diamonds = 0
+            other.x, other.y = other.base
+            bot.tackles += 1
+
+        x, y = self._teleport(x, y)
+        bot.x, bot.y = x, y
+        bot.moves += 1
+
+        diamond = self.diamonds.get((x, y))
+        if diamond and bot.diamonds + diamond.points <= self._config("inventory_size"):
+            bot.diamonds += diamond.points
+            del self.diamonds[(x, y)]
+
+        if self.button and (x, y) == (self.button.x, self.button.y):
+            self.button = None
+            self.generate_diamonds()
+            x, y = self._free_tile()
+            self.button = SimObject(self._new_id(), x, y)
+
+        if (x, y) == bot.base:
+            bot.score += bot.diamonds
+            bot.diamonds = 0
+
+        area = self.width * self.height
+        if len(self.diamonds) < area * self._config("min_ratio_for_generation"):
+            self.generate_diamonds()
+        return True
+
+    def step(self) -> bool:
+        """
+        Let every bot that is still playing make one move
+        :return: False when no bot is left on the board
+        """
+        for bot in list(self.bots):
+            board = self.board()
+            board_bot = board.get_bot(bot)
+            delta_x, delta_y = bot.logic.next_move(board_bot, board)
+            self.move(bot, delta_x, delta_y)
+            if bot.milliseconds_left <= 0:
+                self.bots.remove(bot)
+                self.finished.append(bot)
+        self.steps += 1
+        return bool(self.bots)
+
+    def run(self, max_steps: Optional[int] = None) -> Dict[str, int]:
+        """
+        Play until every bot is out of time or for max_steps steps
+        :return: score per bot name
+        """
+        while self.bots and (max_steps is None or self.steps < max_steps):
+            self.step()
+        return {bot.name: bot.score for bot in self.finished + self.bots}
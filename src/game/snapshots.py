@@ -0,0 +1,244 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from game.models import Base, Board, GameObject, Position, Properties
+
+# Stands for None in the integer columns
+_NONE = -(2**31)
+
+
+def _int(value: Optional[int]) -> int:
+    return _NONE if value is None else value
+
+
+def _value(stored: int) -> Optional[int]:
+    return None if stored == _NONE else stored
+
+
+class SnapshotStore:
+    """
+    History of a board, one snapshot per tick, stored as a keyframe with
+    every object followed by per tick deltas keyed by GameObject.id: the
+    objects that were added or changed and the ids of the removed ones.
+
+    Rows are kept as struct of arrays, one typed array per column. The
+    properties that change during a game (points, diamonds, score and time
+    left) get their own columns, the rest of the properties and the type
+    are stored once in lookup tables and referenced by index. A diamond
+    that sits still for the whole game costs one row.
+
+    A new keyframe is started when the board itself (size, features,
+    delay) changes and, with keyframe_every, every that many ticks so that
+    rebuilding a tick replays fewer deltas.
+    """
+
+    def __init__(self, keyframe_every: Optional[int] = None):
+        self.keyframe_every = keyframe_every
+        # Row columns
+        self._ids = array("q")
+        self._xs = array("i")
+        self._ys = array("i")
+        self._types = array("b")
+        # Index into _static_keys, -1 for objects without properties
+        self._statics = array("i")
+        self._points = array("i")
+        self._diamonds = array("i")
+        self._scores = array("i")
+        self._milliseconds = array("q")
+        # Removed ids column
+        self._removed = array("q")
+        # Offsets of the rows and removed ids of each tick, tick t owns
+        # [offset[t], offset[t + 1])
+        self._row_offsets = array("q", [0])
+        self._removed_offsets = array("q", [0])
+        # Ticks that start a keyframe and the board without objects for each
+        self._keyframes: List[int] = []
+        self._templates: List[Board] = []
+        # Lookup tables
+        self._type_names: List[str] = []
+        self._type_index: Dict[str, int] = {}
+        # (pair_id, name, inventory_size, can_tackle, time_joined, base x, base y)
+        self._static_keys: List[tuple] = []
+        self._static_index: Dict[tuple, int] = {}
+        # Per id the row of the last appended tick, without the id
+        self._last: Dict[int, tuple] = {}
+        # Last rebuilt tick and its row number per id, to continue from
+        self._cursor: Optional[Tuple[int, Dict[int, int]]] = None
+
+    def __len__(self) -> int:
+        return len(self._row_offsets) - 1
+
+    @property
+    def keyframes(self) -> int:
+        return len(self._keyframes)
+
+    @property
+    def rows(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the column arrays, without the lookup tables
+        """
+        columns = (
+            self._ids,
+            self._xs,
+            self._ys,
+            self._types,
+            self._statics,
+            self._points,
+            self._diamonds,
+            self._scores,
+            self._milliseconds,
+            self._removed,
+            self._row_offsets,
+            self._removed_offsets,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _type(self, type_name: str) -> int:
+        index = self._type_index.get(type_name)
+        if index is None:
+            index = self._type_index[type_name] = len(self._type_names)
+            self._type_names.append(type_name)
+        return index
+
+    def _static(self, props: Properties) -> int:
+        base = props.base
+        key = (
+            props.pair_id,
+            props.name,
+            props.inventory_size,
+            props.can_tackle,
+            props.time_joined,
+            base.x if base else None,
+            base.y if base else None,
+        )
+        index = self._static_index.get(key)
+        if index is None:
+            index = self._static_index[key] = len(self._static_keys)
+            self._static_keys.append(key)
+        return index
+
+    def _row(self, obj: GameObject) -> tuple:
+        props = obj.properties
+        if props is None:
+            return (
+                obj.position.x,
+                obj.position.y,
+                self._type(obj.type),
+                -1,
+                _NONE,
+                _NONE,
+                _NONE,
+                _NONE,
+            )
+        return (
+            obj.position.x,
+            obj.position.y,
+            self._type(obj.type),
+            self._static(props),
+            _int(props.points),
+            _int(props.diamonds),
+            _int(props.score),
+            _int(props.milliseconds_left),
+        )
+
+    def _add_row(self, obj_id: int, row: tuple):
+        x, y, type_index, static, points, diamonds, score, milliseconds = row
+        self._ids.append(obj_id)
+        self._xs.append(x)
+        self._ys.append(y)
+        self._types.append(type_index)
+        self._statics.append(static)
+        self._points.append(points)
+        self._diamonds.append(diamonds)
+        self._scores.append(score)
+        self._milliseconds.append(milliseconds)
+
+    def append(self, board: Board) -> int:
+        """
+        Store the snapshot of the next tick
+        :return: the tick number of board
+        """
+        tick = len(self)
+        template = replace(board, game_objects=[])
+        keyframe = (
+            not self._templates
+            or template != self._templates[-1]
+            or (self.keyframe_every and tick - self._keyframes[-1] >= self.keyframe_every)
+        )
+
+        current = {o.id: self._row(o) for o in board.game_objects or []}
+        if keyframe:
+            self._keyframes.append(tick)
+            self._templates.append(template)
+            for obj_id, row in current.items():
+                self._add_row(obj_id, row)
+        else:
+            last = self._last
+            for obj_id, row in current.items():
+                if last.get(obj_id) != row:
+                    self._add_row(obj_id, row)
+            self._removed.extend(obj_id for obj_id in last if obj_id not in current)
+        self._last = current
+        self._row_offsets.append(len(self._ids))
+        self._removed_offsets.append(len(self._removed))
+        return tick
+
+    def _rows_at(self, tick: int) -> Dict[int, int]:
+        keyframe = self._keyframes[bisect_right(self._keyframes, tick) - 1]
+        if self._cursor is not None and keyframe <= self._cursor[0] <= tick:
+            start, rows = self._cursor[0] + 1, dict(self._cursor[1])
+        else:
+            start, rows = keyframe, {}
+        for t in range(start, tick + 1):
+            for i in range(self._row_offsets[t], self._row_offsets[t + 1]):
+                rows[self._ids[i]] = i
+            for i in range(self._removed_offsets[t], self._removed_offsets[t + 1]):
+                rows.pop(self._removed[i], None)
+        self._cursor = (tick, rows)
+        return rows
+
+    def _object(self, obj_id: int, i: int) -> GameObject:
+        properties = None
+        static = self._statics[i]
+        if static >= 0:
+            key = self._static_keys[static]
+            pair_id, name, inventory_size, can_tackle, time_joined, bx, by = key
+            properties = Properties(
+                points=_value(self._points[i]),
+                pair_id=pair_id,
+                diamonds=_value(self._diamonds[i]),
+                score=_value(self._scores[i]),
+                name=name,
+                inventory_size=inventory_size,
+                can_tackle=can_tackle,
+                milliseconds_left=_value(self._milliseconds[i]),
+                time_joined=time_joined,
+                base=Base(by, bx) if bx is not None else None,
+            )
+        return GameObject(
+            obj_id,
+            Position(self._ys[i], self._xs[i]),
+            self._type_names[self._types[i]],
+            properties,
+        )
+
+    def board(self, tick: int) -> Board:
+        """
+        Rebuild the board of a tick from its keyframe and the deltas after
+        it. Objects are in the order they first appeared since the keyframe.
+        """
+        if tick < 0:
+            tick += len(self)
+        if not 0 <= tick < len(self):
+            raise IndexError("tick {} not in store of {} ticks".format(tick, len(self)))
+        rows = self._rows_at(tick)
+        template = self._templates[bisect_right(self._keyframes, tick) - 1]
+        return replace(
+            template, game_objects=[self._object(obj_id, i) for obj_id, i in rows.items()]
+        )
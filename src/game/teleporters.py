@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+
+from game.models import Board, GameObject, Position
+
+Tile = Tuple[int, int]
+
+
+def _distance(ax: int, ay: int, bx: int, by: int) -> int:
+    return abs(ax - bx) + abs(ay - by)
+
+
+class TeleporterIndex:
+    """
+    Teleporter pairs of the board and the portals they make, kept between
+    ticks. update only rebuilds when the position or pair_id of a teleporter
+    changed, and routes are answered with one pass over the portals.
+
+    One index is meant to be shared by everything of a logic that looks at
+    teleporters, updating it again with the same board costs nothing.
+    """
+
+    def __init__(self):
+        # Teleporters by pair_id, incomplete pairs included
+        self.pairs: Dict[str, List[GameObject]] = {}
+        # (entry x, entry y, exit x, exit y, entry) for both directions of
+        # every complete pair, in pair order
+        self.portals: List[Tuple[int, int, int, int, GameObject]] = []
+        # Tile of every teleporter of a complete pair to the tile of its partner
+        self.links: Dict[Tile, Tile] = {}
+        # Bumped on every rebuild, a version of pairs, portals and links
+        self.builds = 0
+        self._board: Optional[Board] = None
+        self._signature = None
+        # Cost to reach and step through every portal from the last source,
+        # routes are mostly asked from the same tile many times in a row
+        self._source = None
+        self._legs: List[Tuple[int, int, int, GameObject]] = []
+
+    def update(self, board: Board) -> bool:
+        """
+        :return: True when the index was rebuilt
+        """
+        if board is self._board:
+            return False
+        self._board = board
+        teleporters = board.objects_by_type("TeleportGameObject")
+        signature = tuple(
+            (tp.properties.pair_id, tp.position.x, tp.position.y) for tp in teleporters
+        )
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.builds += 1
+
+        self.pairs = {}
+        for tp in teleporters:
+            self.pairs.setdefault(tp.properties.pair_id, []).append(tp)
+        self.portals = []
+        self.links = {}
+        for pair in self.pairs.values():
+            if len(pair) != 2:
+                continue
+            t1, t2 = pair
+            p1, p2 = t1.position, t2.position
+            self.portals.append((p1.x, p1.y, p2.x, p2.y, t1))
+            self.portals.append((p2.x, p2.y, p1.x, p1.y, t2))
+            self.links[(p1.x, p1.y)] = (p2.x, p2.y)
+            self.links[(p2.x, p2.y)] = (p1.x, p1.y)
+        self._source = None
+        return True
+
+    def route(self, src: Position, dst: Position) -> Tuple[int, Optional[GameObject]]:
+        """
+        Cheapest way from src to dst, walking or through one teleporter
+        :return: (moves, teleporter to step on or None to walk)
+        """
+        sx, sy, dx, dy = src.x, src.y, dst.x, dst.y
+        best = abs(sx - dx) + abs(sy - dy)
+        entry = None
+        if not self.portals:
+            return best, entry
+        if self._source != (sx, sy):
+            self._source = (sx, sy)
+            self._legs = [
+                (_distance(sx, sy, ex, ey) + 1, ox, oy, tp)
+                for ex, ey, ox, oy, tp in self.portals
+            ]
+        for cost, ox, oy, tp in self._legs:
+            d = cost + abs(ox - dx) + abs(oy - dy)
+            if d < best:
+                best = d
+                entry = tp
+        return best, entry
+
+    def distance(self, src: Position, dst: Position) -> int:
+        return self.route(src, dst)[0]
+
+    def nearest_entry(self, src: Position) -> Optional[GameObject]:
+        """
+        Closest teleporter of a complete pair
+        """
+        nearest = None
+        min_dist = None
+        for ex, ey, _, _, tp in self.portals:
+            d = _distance(src.x, src.y, ex, ey)
+            if min_dist is None or d < min_dist:
+                min_dist = d
+                nearest = tp
+        return nearest
@@ -0,0 +1,228 @@
+import json
+import logging
+import threading
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import requests
+from decode import decode
+from game.lazy_board import loads
+from game.loader import load
+from game.models import Board, GameObject
+
+if TYPE_CHECKING:
+    from game.api import Api
+
+logger = logging.getLogger(__name__)
+
+
+class PollingTransport:
+    """
+    Board reads with GET /boards/{id}, a whole board per read
+    """
+
+    def __init__(self):
+        self.bytes_received = 0
+
+    def get_board(self, api: "Api", board_id: int) -> Optional[Board]:
+        response = api._req("/boards/{}".format(board_id), "get", {})
+        self.bytes_received += len(response.content)
+        return api._load_board(response)
+
+    def get_board_if_changed(
+        self, api: "Api", board_id: int, etag: Optional[str]
+    ) -> Tuple[Optional[Board], Optional[str], bool]:
+        headers = {"If-None-Match": etag} if etag else None
+        response = api._req("/boards/{}".format(board_id), "get", {}, headers)
+        self.bytes_received += len(response.content)
+        if response.status_code == 304:
+            return None, etag, True
+        board = api._load_board(response)
+        if board is not None:
+            return board, response.headers.get("ETag"), False
+        return None, None, False
+
+    def close(self):
+        pass
+
+
+class StreamTransport:
+    """
+    Board reads from the server-sent events of GET /boards/{id}/stream. The
+    stream starts with a "snapshot" event holding a whole board, then sends
+    a "diff" event for every change with the objects that were added or
+    changed and the ids of the removed ones. Diffs are applied to a local
+    snapshot on a reader thread, so reading the board costs no round trip.
+    While the stream is down boards are polled instead.
+
+    With a recorder on the Api the JSON of the snapshot is kept as well and
+    every new version read is recorded as a whole board, like a polled one.
+    """
+
+    def __init__(self, connect_timeout: float = 5.0):
+        self.connect_timeout = connect_timeout
+        self.bytes_received = 0
+        self.events = 0
+        # Bumped with every event applied to the snapshot
+        self.version = 0
+        self._polling = PollingTransport()
+        self._changed = threading.Condition()
+        self._board_id: Optional[int] = None
+        self._template: Optional[Board] = None
+        self._objects: Dict[int, GameObject] = {}
+        self._board: Optional[Board] = None
+        # JSON of the snapshot, the board without its game objects and the
+        # objects by id, only kept while recording
+        self._raw_board: Optional[dict] = None
+        self._raw_objects: Dict[int, dict] = {}
+        self._recorded: Optional[int] = None
+        self._response: Optional[requests.Response] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Set when the server has no board stream, boards are polled then
+        self.unsupported = False
+
+    def _connect(self, api: "Api", board_id: int):
+        if self._thread is not None and self._thread.is_alive() and board_id == self._board_id:
+            return
+        self._disconnect()
+        self._closed = False
+        self._board_id = board_id
+        self._template = None
+        self._raw_board = None
+        self._thread = threading.Thread(
+            target=self._read, args=(api, board_id), name="board-stream", daemon=True
+        )
+        self._thread.start()
+
+    def _read(self, api: "Api", board_id: int):
+        try:
+            get = api._get_session().get if api.pooled else requests.get
+            response = get(
+                api._get_url("/boards/{}/stream".format(board_id)),
+                headers={"Accept": "text/event-stream"},
+                stream=True,
+                # No read timeout, the stream is quiet while nothing changes
+                timeout=(self.connect_timeout, None),
+            )
+            self._response = response
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code != 200 or not content_type.startswith("text/event-stream"):
+                logger.info("<<< %s board stream unavailable, polling", response.status_code)
+                self.unsupported = True
+                return
+            event, data, pending = None, [], b""
+            for chunk in response.iter_content(chunk_size=None):
+                self.bytes_received += len(chunk)
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    line = line.rstrip(b"\r")
+                    if not line:
+                        if data:
+                            self._apply(event, b"\n".join(data), api.recorder is not None)
+                        event, data = None, []
+                    elif line.startswith(b"event:"):
+                        event = line[6:].strip().decode()
+                    elif line.startswith(b"data:"):
+                        data.append(line[5:].strip())
+        except (requests.RequestException, AttributeError, ValueError) as e:
+            # AttributeError when close() pulled the connection from under us
+            if not self._closed:
+                logger.info("Board stream closed: %s", e)
+        finally:
+            with self._changed:
+                self._template = None
+                self._changed.notify_all()
+
+    def _apply(self, event: Optional[str], data: bytes, keep_raw: bool = False):
+        payload = loads(data)
+        with self._changed:
+            if event == "snapshot":
+                if keep_raw:
+                    self._raw_objects = {o["id"]: o for o in payload.get("gameObjects") or []}
+                    self._raw_board = dict(payload, gameObjects=None)
+                board = load(Board, decode(payload))
+                self._objects = {o.id: o for o in board.game_objects or []}
+                self._template = replace(board, game_objects=[])
+            elif event == "diff" and self._template is not None:
+                for obj_id in payload.get("removed", ()):
+                    self._objects.pop(obj_id, None)
+                    self._raw_objects.pop(obj_id, None)
+                for raw in payload.get("changed", ()):
+                    obj = load(GameObject, decode(raw))
+                    self._objects[obj.id] = obj
+                    if keep_raw:
+                        self._raw_objects[obj.id] = raw
+            else:
+                return
+            self.events += 1
+            self.version += 1
+            self._board = None
+            self._changed.notify_all()
+
+    def _snapshot(self) -> Optional[Board]:
+        if self._template is None:
+            return None
+        if self._board is None:
+            self._board = replace(self._template, game_objects=list(self._objects.values()))
+        return self._board
+
+    def wait_for_update(self, version: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until the snapshot is newer than version or the timeout passed
+        :return: the current version
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self.version > version or self._template is None, timeout
+            )
+            return self.version
+
+    def get_board(self, api: "Api", board_id: int) -> Optional[Board]:
+        if self.unsupported:
+            return self._polling.get_board(api, board_id)
+        self._connect(api, board_id)
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._template is not None or not self._thread.is_alive(),
+                self.connect_timeout,
+            )
+            board = self._snapshot()
+            if board is not None and api.recorder and self._recorded != self.version:
+                self._record(api)
+        if board is None:
+            return self._polling.get_board(api, board_id)
+        return board
+
+    def _record(self, api: "Api"):
+        if self._raw_board is None:
+            return
+        raw = dict(self._raw_board, gameObjects=list(self._raw_objects.values()))
+        api.recorder.record_board(json.dumps({"data": raw}).encode())
+        self._recorded = self.version
+
+    def get_board_if_changed(
+        self, api: "Api", board_id: int, etag: Optional[str]
+    ) -> Tuple[Optional[Board], Optional[str], bool]:
+        """
+        The ETag is the snapshot version while the stream is up
+        """
+        if self.unsupported:
+            return self._polling.get_board_if_changed(api, board_id, etag)
+        board = self.get_board(api, board_id)
+        if self._template is None:
+            return board, None, False
+        version = str(self.version)
+        if version == etag:
+            return None, etag, True
+        return board, version, False
+
+    def _disconnect(self):
+        self._closed = True
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def close(self):
+        self._disconnect()
+        self._polling.close()
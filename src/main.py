@@ -1,22 +1,28 @@
 import argparse
-from time import sleep
+import logging
+import random
+from time import monotonic
 
 from colorama import Back, Fore, Style, init
 from game.api import Api
 from game.board_handler import BoardHandler
+from game.board_state import BoardState
 from game.bot_handler import BotHandler
-from game.logic.random import RandomLogic
+from game.logic import CONTROLLERS
 from game.util import *
 from game.logic.base import BaseLogic
-from game.logic.pesemka import Pesemka
+from game.log import setup_logging
+from game.metrics import PhaseStats, profile_logic
+from game.anytime import AnytimeRunner
+from game.pacing import Deadline, TickScheduler
+from game.pipeline import MovePipeline
+from game.replay import ReplayRecorder
+from game.transport import PollingTransport, StreamTransport
 
 init()
+logger = logging.getLogger("game.main")
 BASE_URL = "http://localhost:3000/api"
 DEFAULT_BOARD_ID = 1
-CONTROLLERS = {
-    "Random": RandomLogic,
-    "Pesemka" : Pesemka
-}
 
 ###############################################################################
 #
@@ -56,10 +62,118 @@ group = parser.add_argument_group("API connection")
 group.add_argument(
     "--host", action="store", default=BASE_URL, help="Default: {}".format(BASE_URL)
 )
+group.add_argument(
+    "--no-pool",
+    help="Open a new connection for every request instead of reusing a keep-alive session",
+    action="store_true",
+)
+group.add_argument(
+    "--pool-size", help="Size of the HTTP connection pool", default=10, type=int
+)
+group.add_argument(
+    "--timeout", help="Timeout in seconds for each request", default=5.0, type=float
+)
+group.add_argument(
+    "--retries",
+    help="Number of retries with backoff for failed connections",
+    default=2,
+    type=int,
+)
+group.add_argument(
+    "--lazy-board",
+    help="Only build the game objects of a board the logic reads, and parse with orjson when it is installed",
+    action="store_true",
+)
+group.add_argument(
+    "--stream",
+    help="Keep the board up to date from the event stream of the server instead of "
+    "polling it, the next move is computed as soon as the board changes",
+    action="store_true",
+)
+parser.add_argument(
+    "--seed",
+    help="Seed of the random numbers of the logic, recorded with --record. Default: a random seed",
+    type=int,
+    action="store",
+)
+parser.add_argument(
+    "--record",
+    help="Append the boards and moves of this game to a replay recording",
+    action="store",
+)
+# Both run the logic off the game loop, on the same logic state
+group = parser.add_mutually_exclusive_group()
+group.add_argument(
+    "--pipeline",
+    help="Compute the next move from the predicted board while the current move is in flight",
+    action="store_true",
+)
+group.add_argument(
+    "--anytime",
+    help="Give the logic a deadline each tick and play a fallback move when it is not ready",
+    action="store_true",
+)
+parser.add_argument(
+    "--logic-budget",
+    help="Part of the move delay the logic may use with --anytime. Default: 0.5",
+    default=0.5,
+    type=float,
+)
+group = parser.add_argument_group("Instrumentation")
+group.add_argument(
+    "--stats",
+    help="Time each phase of the game loop and print p50/p95/p99 at game over",
+    action="store_true",
+)
+group.add_argument(
+    "--stats-interval",
+    help="Also log the phase stats every this many seconds while playing",
+    default=0,
+    type=float,
+)
+group.add_argument(
+    "--profile",
+    help="Profile the logic with cProfile and write the stats to this file",
+    action="store",
+)
+group.add_argument(
+    "--profile-every",
+    help="Only profile every n-th move of the logic",
+    default=1,
+    type=int,
+)
+group = parser.add_argument_group("Logging")
+group.add_argument(
+    "--log-level",
+    help="Console log level, DEBUG shows every request. Default: WARNING",
+    default="WARNING",
+    action="store",
+)
+group.add_argument(
+    "--log-file",
+    help="Also write log records to this JSON lines file, off the game loop",
+    action="store",
+)
+group.add_argument(
+    "--log-file-level",
+    help="Log level of the --log-file records. Default: DEBUG",
+    default="DEBUG",
+    action="store",
+)
 args = parser.parse_args()
+setup_logging(args.log_level, args.log_file, args.log_file_level)
 
-time_factor = int(args.time_factor)
-api = Api(args.host)
+time_factor = float(args.time_factor)
+api = Api(
+    args.host,
+    pooled=not args.no_pool,
+    pool_size=args.pool_size,
+    timeout=args.timeout,
+    retries=args.retries,
+    recorder=ReplayRecorder(args.record) if args.record else None,
+    transport=StreamTransport() if args.stream else PollingTransport(),
+    lazy=args.lazy_board,
+)
 bot_handler = BotHandler(api)
 board_handler = BoardHandler(api)
 
@@ -115,7 +229,14 @@ print(Fore.BLUE + Style.BRIGHT + "Welcome back, " + Style.RESET_ALL + bot.name)
 
 # Setup variables
 logic_class = CONTROLLERS[logic_controller]
+# Seeded before the logic is made, a replay seeds the same way
+seed = args.seed if args.seed is not None else random.randrange(2**32)
+random.seed(seed)
 bot_logic: BaseLogic = logic_class()
+if api.recorder:
+    api.recorder.record_meta(bot=bot.name, logic=logic_controller, seed=seed)
+profiler = profile_logic(bot_logic, args.profile_every) if args.profile else None
+stats = PhaseStats(enabled=args.stats or args.stats_interval > 0)
 
 ###############################################################################
 #
@@ -160,8 +281,22 @@ if not current_board_id:
 # Prepare state from current board
 #
 ###############################################################################
-board = board_handler.get_board(current_board_id)
-move_delay = board.minimum_delay_between_moves / 1000
+board_state = BoardState(board_handler, current_board_id)
+board = board_state.fetch()
+# Don't spam the board more than it allows!
+scheduler = TickScheduler.for_board(board.minimum_delay_between_moves, time_factor)
+# A snapshot is never reused past the tick it was received in
+board_state.max_age = scheduler.interval
+scheduler.start()
+last_stats_dump = monotonic()
+pipeline = (
+    MovePipeline(bot_handler, bot_logic, bot, current_board_id) if args.pipeline else None
+)
+next_move = None
+anytime = AnytimeRunner(bot_logic) if args.anytime else None
+stream = api.transport if args.stream else None
+# Set when the logic ran on a streamed board before the tick was due
+tick_pending = False
 
 ###############################################################################
 #
@@ -175,27 +310,66 @@ while True:
         # Managed to get game over
         break
 
-    # Calculate next move
-    delta_x, delta_y = bot_logic.next_move(board_bot, board)
+    # Calculate next move, unless it was already computed while moving
+    logic_start = monotonic()
+    with stats.phase("logic"):
+        if next_move:
+            delta_x, delta_y = next_move
+        elif anytime:
+            delta_x, delta_y = anytime.next_move(
+                board_bot, board, Deadline.after(scheduler.interval * args.logic_budget)
+            )
+        else:
+            delta_x, delta_y = bot_logic.next_move(board_bot, board)
+    next_move = None
+    if api.recorder:
+        api.recorder.record_move(delta_x, delta_y, monotonic() - logic_start)
     # delta_x, delta_y = (1, 0)
     if not board.is_valid_move(board_bot.position, delta_x, delta_y):
-        print(
-            Fore.YELLOW + Style.BRIGHT + "Warn:" + Style.RESET_ALL,
-            "Invalid move will be ignored."
-            + f" Your move: ({delta_x}, {delta_y}). Your position: ({board_bot.position.x}, {board_bot.position.y})",
+        logger.warning(
+            "Warn: Invalid move will be ignored. Your move: (%s, %s). Your position: (%s, %s)",
+            delta_x,
+            delta_y,
+            board_bot.position.x,
+            board_bot.position.y,
         )
-        sleep(1)
+        with stats.phase("sleep"):
+            scheduler.wait()
+        # Other bots moved while we waited, only a 304 keeps the snapshot
+        board_state.invalidate()
+        with stats.phase("fetch"):
+            board = board_state.get()
+        if not board:
+            break
+        tick_pending = False
         continue
 
+    if tick_pending:
+        # The move is ready, send it once the board allows
+        with stats.phase("sleep"):
+            drift = scheduler.wait()
+        logger.debug("~~~ Tick %d drift %+.1f ms", len(scheduler.drifts), drift * 1000)
+        tick_pending = False
+
+    stream_version = stream.version if stream else 0
     try:
         # Try to perform move
-        board = bot_handler.move(bot.id, current_board_id, delta_x, delta_y)
+        with stats.phase("move"):
+            if pipeline:
+                board, next_move = pipeline.move(board, board_bot, delta_x, delta_y)
+            else:
+                board = bot_handler.move(bot.id, current_board_id, delta_x, delta_y)
     except Exception as e:
         break
 
+    if board:
+        board_state.update(board)
+    # The board of the move response is reused, otherwise get fetches one
+    # unless the snapshot is still fresh
+    with stats.phase("fetch"):
+        board = board_state.get()
     if not board:
-        # Read new board state
-        board = board_handler.get_board(current_board_id)
+        break
 
     # Get new state
     board_bot = board.get_bot(bot)
@@ -203,9 +377,29 @@ while True:
         # Managed to get game over after move
         break
 
-    # Don't spam the board more than it allows!
-    # sleep(move_delay * time_factor)
-    sleep(1)
+    if stream and not stream.unsupported:
+        # Wake on the first board change after our move instead of sleeping
+        # out the tick, the next move is computed on it while the tick runs
+        with stats.phase("sleep"):
+            woke = stream.wait_for_update(stream_version, scheduler.remaining())
+        if woke > stream_version:
+            # The stream saw the board change since the move response
+            with stats.phase("fetch"):
+                board = board_state.get(force=True)
+            if not board:
+                break
+            # Predicted for the board of the move response
+            next_move = None
+        tick_pending = True
+    else:
+        # Wait for the rest of the tick, HTTP and logic time already count
+        with stats.phase("sleep"):
+            drift = scheduler.wait()
+        logger.debug("~~~ Tick %d drift %+.1f ms", len(scheduler.drifts), drift * 1000)
+
+    if args.stats_interval and monotonic() - last_stats_dump >= args.stats_interval:
+        last_stats_dump = monotonic()
+        print(stats.summary())
 
 
 ###############################################################################
@@ -214,3 +408,21 @@ while True:
 #
 ###############################################################################
 print(Fore.BLUE + Style.BRIGHT + "Game over!" + Style.RESET_ALL)
+print(
+    "Tick drift over {} ticks: mean {:+.1f} ms, max {:+.1f} ms".format(
+        len(scheduler.drifts), scheduler.mean_drift * 1000, scheduler.max_drift * 1000
+    )
+)
+print(board_state.summary())
+if api.recorder:
+    api.recorder.close()
+if anytime:
+    print(anytime.summary())
+if pipeline:
+    pipeline.close()
+    print(pipeline.summary())
+if stats.enabled:
+    print(stats.summary())
+if profiler:
+    profiler.dump_stats(args.profile)
+    print("Logic profile written to {}".format(args.profile))
@@ -0,0 +1,96 @@
+import argparse
+import json
+import random
+import time
+
+from colorama import Fore, Style, init
+from decode import decode
+from game.api import unwrap_response
+from game.loader import load
+from game.logic import CONTROLLERS
+from game.logic.base import BaseLogic
+from game.models import Board, Bot
+from game.replay import BOARD, META, MOVE, read_records
+
+init()
+
+###############################################################################
+#
+# Parse command line arguments
+#
+###############################################################################
+parser = argparse.ArgumentParser(
+    description="Feed a recorded game through a logic at full speed, without a server"
+)
+parser.add_argument("file", help="Recording made with main.py --record")
+parser.add_argument(
+    "--logic",
+    help="The logic controller to replay with, defaults to the recorded one. "
+    "Valid options are: {}".format(", ".join(list(CONTROLLERS.keys()))),
+    action="store",
+)
+parser.add_argument(
+    "--name", help="Name of our bot, defaults to the recorded one", action="store"
+)
+parser.add_argument(
+    "--slowest", help="Number of slowest ticks to list", default=5, type=int
+)
+
+
+def main(args):
+    logic_name = args.logic
+    name = args.name
+    seed = None
+    bot_logic: BaseLogic = None
+    board = None
+    ticks = 0
+    differences = 0
+    slowest = []
+
+    for kind, timestamp, payload in read_records(args.file):
+        if kind == META:
+            meta = json.loads(payload)
+            logic_name = logic_name or meta.get("logic")
+            name = name or meta.get("bot")
+            seed = meta.get("seed", seed)
+        elif kind == BOARD:
+            board = load(Board, decode(unwrap_response(json.loads(payload))))
+        elif kind == MOVE and board is not None:
+            if bot_logic is None:
+                if logic_name not in CONTROLLERS or not name:
+                    raise SystemExit("Unknown logic or bot name, use --logic and --name")
+                # Same random numbers as the recorded game
+                if seed is not None:
+                    random.seed(seed)
+                bot_logic = CONTROLLERS[logic_name]()
+            board_bot = board.get_bot(Bot(name=name, email="", id=""))
+            if not board_bot:
+                continue
+            recorded = json.loads(payload)
+            start = time.perf_counter()
+            move = bot_logic.next_move(board_bot, board)
+            elapsed = time.perf_counter() - start
+            ticks += 1
+            if tuple(move) != (recorded["dx"], recorded["dy"]):
+                differences += 1
+            slowest.append((elapsed, ticks, recorded["logic_ms"]))
+            slowest = sorted(slowest, reverse=True)[: args.slowest]
+
+    print(
+        Fore.BLUE + Style.BRIGHT + "Replayed " + Style.RESET_ALL
+        + "{} ticks of {} with {}, {} moves differ from the recording".format(
+            ticks, name, logic_name, differences
+        )
+    )
+    if seed is None:
+        print("The recording has no seed, logics that use random numbers differ")
+    for elapsed, tick, recorded_ms in slowest:
+        print(
+            "tick {:6}: {:8.2f} ms now, {:8.2f} ms when recorded".format(
+                tick, elapsed * 1000, recorded_ms
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from colorama import Fore, Style, init
+from game.api import Api, AsyncApi
+from game.board_handler import AsyncBoardHandler
+from game.bot_handler import AsyncBotHandler
+from game.logic import CONTROLLERS
+from game.logic.base import BaseLogic
+from game.logic.executor import ExecutorLogic, LogicWorkers
+from game.models import Bot
+from game.log import setup_logging
+from game.pacing import TickScheduler
+
+init()
+logger = logging.getLogger("game.run_many")
+BASE_URL = "http://localhost:3000/api"
+DEFAULT_BOARD_ID = 1
+# A bot gives up after this many board reads in a row failed
+MAX_FAILED_READS = 5
+
+###############################################################################
+#
+# Parse command line arguments
+#
+###############################################################################
+parser = argparse.ArgumentParser(
+    description="Run many diamonds bots from one process and one event loop"
+)
+parser.add_argument(
+    "--bot",
+    help="A bot to run, either LOGIC,TOKEN for an existing bot or "
+    "LOGIC,EMAIL,NAME,PASSWORD,TEAM to recover or register one. "
+    "Can be given multiple times. Valid logics are: {}".format(
+        ", ".join(list(CONTROLLERS.keys()))
+    ),
+    action="append",
+    default=[],
+)
+parser.add_argument(
+    "--board", help="Id of the board to join", default=DEFAULT_BOARD_ID, action="store"
+)
+parser.add_argument(
+    "--time-factor",
+    help="A factor to multiply each move command with. If you want to run the bot in a slower mode e.g. use --time-factor=5 to multiply each delay with 5.",
+    default=1,
+    action="store",
+)
+group = parser.add_argument_group("API connection")
+group.add_argument(
+    "--host", action="store", default=BASE_URL, help="Default: {}".format(BASE_URL)
+)
+group.add_argument(
+    "--pool-size",
+    help="Size of the HTTP connection pool shared by all bots",
+    default=32,
+    type=int,
+)
+group.add_argument(
+    "--timeout", help="Timeout in seconds for each request", default=5.0, type=float
+)
+group.add_argument(
+    "--retries",
+    help="Number of retries with backoff for failed connections",
+    default=2,
+    type=int,
+)
+
+group = parser.add_argument_group("Logic workers")
+group.add_argument(
+    "--logic-workers",
+    help="Compute the moves on this many workers so a slow logic does not hold "
+    "up the requests of the other bots. Default: 0, on the event loop",
+    default=0,
+    type=int,
+)
+group.add_argument(
+    "--logic-processes",
+    help="Use worker processes instead of threads, for logics heavy enough to "
+    "need more than one CPU",
+    action="store_true",
+)
+
+group = parser.add_argument_group("Logging")
+group.add_argument(
+    "--log-level",
+    help="Console log level, DEBUG shows every request. Default: WARNING",
+    default="WARNING",
+    action="store",
+)
+group.add_argument(
+    "--log-file",
+    help="Also write log records to this JSON lines file, off the game loop",
+    action="store",
+)
+group.add_argument(
+    "--log-file-level",
+    help="Log level of the --log-file records. Default: DEBUG",
+    default="DEBUG",
+    action="store",
+)
+
+
+def _error(message: str):
+    print(Fore.RED + Style.BRIGHT + "Error: " + Style.RESET_ALL + message)
+
+
+async def _get_token(bot_handler: AsyncBotHandler, spec: List[str]) -> Optional[str]:
+    if len(spec) == 1:
+        return spec[0]
+
+    email, name, password, team = spec
+    token = await bot_handler.recover(email, password)
+    if token:
+        return token
+    bot = await bot_handler.register(name, email, password, team)
+    if bot:
+        print(Style.BRIGHT + "Bot registered. Token: {}".format(bot.id) + Style.RESET_ALL)
+        return bot.id
+    return None
+
+
+async def play(
+    bot_handler: AsyncBotHandler,
+    board_handler: AsyncBoardHandler,
+    bot: Bot,
+    bot_logic: BaseLogic,
+    board_id: int,
+    time_factor: float,
+):
+    """
+    Game play loop of one bot. Each bot keeps its own pacing, a slow request
+    or move of one bot does not delay the others.
+    """
+    if not await bot_handler.join(bot.id, board_id):
+        _error("{} was unable to join board {}".format(bot.name, board_id))
+        return
+
+    board = await board_handler.get_board(board_id)
+    if not board:
+        _error("{} was unable to read board {}".format(bot.name, board_id))
+        return
+    # Don't spam the board more than it allows!
+    scheduler = TickScheduler.for_board(board.minimum_delay_between_moves, time_factor)
+    scheduler.start()
+    failed_reads = 0
+
+    while True:
+        if not board:
+            # The board of the last tick is missing or outdated, read it
+            board = await board_handler.get_board(board_id)
+            if not board:
+                failed_reads += 1
+                if failed_reads >= MAX_FAILED_READS:
+                    _error("{} was unable to read board {}".format(bot.name, board_id))
+                    break
+                logger.warning("%s: unable to read board %s, retrying", bot.name, board_id)
+                await scheduler.wait_async()
+                continue
+            failed_reads = 0
+
+        board_bot = board.get_bot(bot)
+        if not board_bot:
+            break
+
+        if isinstance(bot_logic, ExecutorLogic):
+            delta_x, delta_y = await bot_logic.next_move_async(board_bot, board)
+        else:
+            delta_x, delta_y = bot_logic.next_move(board_bot, board)
+        if not board.is_valid_move(board_bot.position, delta_x, delta_y):
+            logger.warning(
+                "Warn: %s: invalid move will be ignored. Your move: (%s, %s). Your position: (%s, %s)",
+                bot.name,
+                delta_x,
+                delta_y,
+                board_bot.position.x,
+                board_bot.position.y,
+            )
+            await scheduler.wait_async()
+            # Other bots moved while we waited, read the board again
+            board = None
+            continue
+
+        try:
+            new_board = await bot_handler.move(
+                bot.id, board_id, delta_x, delta_y
+            )
+        except Exception:
+            break
+
+        # Without a board in the move response it is read on the next tick
+        board = new_board
+        if board and not board.get_bot(bot):
+            break
+
+        await scheduler.wait_async()
+
+    print(
+        Fore.BLUE + Style.BRIGHT + "Game over for " + Style.RESET_ALL + bot.name,
+        "(tick drift mean {:+.1f} ms, max {:+.1f} ms)".format(
+            scheduler.mean_drift * 1000, scheduler.max_drift * 1000
+        ),
+    )
+
+
+async def run_bot(
+    bot_handler: AsyncBotHandler,
+    board_handler: AsyncBoardHandler,
+    spec: str,
+    board_id: int,
+    time_factor: float,
+    workers: Optional[LogicWorkers],
+):
+    logic_name, *credentials = spec.split(",")
+    if logic_name not in CONTROLLERS or len(credentials) not in (1, 4):
+        _error("Invalid bot specification: {}".format(spec))
+        return
+
+    token = await _get_token(bot_handler, credentials)
+    if not token:
+        _error("Unable to register bot: {}".format(spec))
+        return
+
+    bot = await bot_handler.get_my_info(token)
+    if not bot or not bot.name:
+        _error("Bot does not exist: {}".format(spec))
+        return
+    print(Fore.BLUE + Style.BRIGHT + "Welcome back, " + Style.RESET_ALL + bot.name)
+
+    # Every bot gets its own controller instance, controllers keep state
+    if workers:
+        bot_logic: BaseLogic = workers.adapter(logic_name)
+    else:
+        bot_logic = CONTROLLERS[logic_name]()
+    await play(bot_handler, board_handler, bot, bot_logic, board_id, time_factor)
+
+
+async def main(args):
+    api = AsyncApi(
+        Api(
+            args.host,
+            pool_size=args.pool_size,
+            timeout=args.timeout,
+            retries=args.retries,
+        )
+    )
+    bot_handler = AsyncBotHandler(api)
+    board_handler = AsyncBoardHandler(api)
+    workers = None
+    if args.logic_workers > 0:
+        workers = LogicWorkers(args.logic_workers, processes=args.logic_processes)
+    try:
+        # One failing bot must not cancel the others
+        results = await asyncio.gather(
+            *(
+                run_bot(
+                    bot_handler,
+                    board_handler,
+                    spec,
+                    int(args.board),
+                    float(args.time_factor),
+                    workers,
+                )
+                for spec in args.bot
+            ),
+            return_exceptions=True,
+        )
+        for spec, result in zip(args.bot, results):
+            if isinstance(result, Exception):
+                logger.error("Bot %s failed: %r", spec, result, exc_info=result)
+    finally:
+        api.close()
+        if workers:
+            workers.close()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    setup_logging(args.log_level, args.log_file, args.log_file_level)
+    if not args.bot:
+        _error("No bots given, use --bot")
+        exit(1)
+    asyncio.run(main(args))
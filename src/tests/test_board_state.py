@@ -0,0 +1,71 @@
+from game.board_state import BoardState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBoardHandler:
+    """
+    Answers conditional fetches with board, a 304 while the ETag matches
+    """
+
+    def __init__(self, board, etag='"1"'):
+        self.board = board
+        self.etag = etag
+        self.requests = 0
+
+    def get_board_if_changed(self, board_id, etag):
+        self.requests += 1
+        if etag == self.etag:
+            return None, etag, True
+        return self.board, self.etag, False
+
+
+def _state(handler, clock):
+    return BoardState(handler, 1, max_age=0.5, clock=clock)
+
+
+def test_fresh_snapshot_is_reused():
+    handler, clock = FakeBoardHandler("fetched"), FakeClock()
+    state = _state(handler, clock)
+    state.update("moved")
+    clock.now = 0.2
+    assert state.get() == "moved"
+    assert state.get() == "moved"
+    assert (state.saved, state.fetches, handler.requests) == (2, 0, 0)
+
+
+def test_old_snapshot_is_fetched():
+    handler, clock = FakeBoardHandler("fetched"), FakeClock()
+    state = _state(handler, clock)
+    state.update("moved")
+    clock.now = 0.6
+    assert state.get() == "fetched"
+    assert (state.saved, state.fetches) == (0, 1)
+
+
+def test_invalidated_snapshot_is_fetched():
+    handler, clock = FakeBoardHandler("fetched"), FakeClock()
+    state = _state(handler, clock)
+    state.update("moved")
+    state.invalidate()
+    assert state.get() == "fetched"
+    assert (state.saved, state.fetches) == (0, 1)
+
+
+def test_not_modified_keeps_snapshot():
+    handler, clock = FakeBoardHandler("fetched"), FakeClock()
+    state = _state(handler, clock)
+    assert state.fetch() == "fetched"
+    state.board = "kept"
+    state.invalidate()
+    assert state.get() == "kept"
+    assert (state.fetches, state.not_modified, state.saved) == (2, 1, 0)
+    # The 304 made the snapshot current again
+    assert state.get() == "kept"
+    assert state.saved == 1
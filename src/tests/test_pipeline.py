@@ -0,0 +1,35 @@
+from game.logic import CONTROLLERS
+from game.models import Bot
+from game.pipeline import NEAR, board_signature
+from game.simulator import Simulator
+
+
+def _sim():
+    sim = Simulator(15, 15, seed=2)
+    me = sim.add_bot("me", CONTROLLERS["Random"]())
+    other = sim.add_bot("other", CONTROLLERS["Random"]())
+    me.x, me.y = 0, 0
+    return sim, me, other
+
+
+def test_signature_ignores_far_bots():
+    sim, me, other = _sim()
+    other.x, other.y = 14, 14
+    before = board_signature(sim.board(), Bot("me", "", ""))
+    other.x, other.diamonds = 13, 2
+    assert board_signature(sim.board(), Bot("me", "", "")) == before
+
+
+def test_signature_sees_near_bots():
+    sim, me, other = _sim()
+    other.x, other.y = NEAR, 0
+    before = board_signature(sim.board(), Bot("me", "", ""))
+    other.x = NEAR - 1
+    assert board_signature(sim.board(), Bot("me", "", "")) != before
+
+
+def test_signature_sees_our_bot():
+    sim, me, other = _sim()
+    before = board_signature(sim.board(), Bot("me", "", ""))
+    me.diamonds = 1
+    assert board_signature(sim.board(), Bot("me", "", "")) != before
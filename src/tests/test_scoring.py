@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from bench.payloads import make_board_payload
+from decode import decode
+from game.loader import load
+from game.logic.pesemka import Pesemka
+from game.models import Board
+
+np = pytest.importorskip("numpy")
+
+from game.board_array import BoardArrays, best_target
+
+SIZES = [
+    dict(width=15, height=15, diamonds=20, teleporter_pairs=1),
+    dict(width=40, height=40, diamonds=200, teleporter_pairs=3),
+]
+
+
+def _board(seed: int, **size) -> Board:
+    return load(Board, decode(make_board_payload(seed=seed, **size)))
+
+
+def _bots(seed: int, board: Board):
+    """
+    Every bot of board with a random load, including a full inventory
+    """
+    rng = random.Random(seed)
+    for board_bot in board.bots:
+        board_bot.properties.diamonds = rng.randrange(6)
+        yield board_bot
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_best_target_matches_loop(seed):
+    board = _board(seed, **SIZES[seed % 2])
+    loop = Pesemka(vectorized=False)
+    loop.refresh_teleporters(board)
+    arrays = BoardArrays.from_board(board)
+    for board_bot in _bots(seed, board):
+        current, carried = board_bot.position, board_bot.properties.diamonds
+        expected = loop.best_candidate(current, carried, board)
+        actual = best_target(arrays, current, carried, loop.teleporter_pairs)
+        assert actual is expected
+
+
+@pytest.mark.parametrize("seed", range(60))
+@pytest.mark.parametrize("distance_cache", [False, True])
+def test_next_move_matches_loop(seed, distance_cache):
+    board = _board(seed, **SIZES[seed % 2])
+    loop = Pesemka(vectorized=False, distance_cache=distance_cache)
+    vectorized = Pesemka(vectorized=True)
+    for board_bot in _bots(seed, board):
+        assert loop.next_move(board_bot, board) == vectorized.next_move(board_bot, board)
+        assert loop.goal == vectorized.goal
+        assert loop.post_tp_target == vectorized.post_tp_target
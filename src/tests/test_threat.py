@@ -0,0 +1,63 @@
+import pytest
+
+from game.logic import CONTROLLERS
+from game.simulator import Simulator
+
+np = pytest.importorskip("numpy")
+
+from game.threat import ThreatMap
+
+
+def _sim(*loads):
+    """
+    Simulator with our bot first and an enemy carrying each of loads
+    """
+    sim = Simulator(15, 15, seed=1)
+    for i in range(len(loads) + 1):
+        sim.add_bot("bot{}".format(i), CONTROLLERS["Random"]())
+    for bot, diamonds in zip(sim.bots[1:], loads):
+        bot.diamonds = diamonds
+    return sim
+
+
+def _update(threats, sim):
+    board = sim.board()
+    threats.update(board, board.bots[0])
+
+
+def test_weighted_by_enemy_diamonds():
+    sim = _sim(3, 0)
+    threats = ThreatMap(k=2)
+    _update(threats, sim)
+    loaded = sim.bots[1]
+    # Diamonds times k + 1 on the tile of the enemy, one less per step away
+    assert threats.at(loaded.x, loaded.y) == 3 * 3
+    assert threats.at(loaded.x + 1, loaded.y) == 3 * 2
+    assert threats.grid.sum() == 3 * sum(
+        3 - abs(dx) - abs(dy)
+        for dx in range(-2, 3)
+        for dy in range(-2, 3)
+        if abs(dx) + abs(dy) <= 2
+        and 0 <= loaded.x + dx < 15
+        and 0 <= loaded.y + dy < 15
+    )
+
+
+def test_empty_enemies_are_no_threat():
+    sim = _sim(0, 0, 0)
+    threats = ThreatMap()
+    _update(threats, sim)
+    assert not threats.grid.any()
+    assert threats.costs == {}
+
+
+def test_load_change_matches_rebuild():
+    sim = _sim(1, 2, 4)
+    threats = ThreatMap()
+    _update(threats, sim)
+    sim.bots[2].diamonds = 5
+    _update(threats, sim)
+    assert threats.changed == 1
+    rebuilt = ThreatMap()
+    _update(rebuilt, sim)
+    assert (threats.grid == rebuilt.grid).all()
@@ -0,0 +1,165 @@
+import argparse
+import ast
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Tuple
+
+from game.logic import CONTROLLERS
+from game.models import Config
+from game.simulator import Simulator
+
+###############################################################################
+#
+# Parse command line arguments
+#
+###############################################################################
+parser = argparse.ArgumentParser(
+    description="Rank logic controllers over many seeded games on the local simulator"
+)
+parser.add_argument(
+    "--logic",
+    help="A logic to enter, NAME or NAME:key=value,... to pass constructor "
+    "arguments, e.g. Pesemka:vectorized=False. Can be given multiple times. "
+    "Valid names are: {}".format(", ".join(list(CONTROLLERS.keys()))),
+    action="append",
+    default=[],
+)
+parser.add_argument("--games", help="Number of games", default=100, type=int)
+parser.add_argument("--seed", help="Seed of the first game", default=0, type=int)
+parser.add_argument(
+    "--bots-per-logic", help="Bots of each logic in every game", default=1, type=int
+)
+parser.add_argument("--width", default=15, type=int)
+parser.add_argument("--height", default=15, type=int)
+parser.add_argument("--seconds", help="Length of each game", default=60, type=int)
+parser.add_argument(
+    "--workers", help="Worker processes, defaults to the CPU count", default=None, type=int
+)
+parser.add_argument(
+    "--out", help="JSONL file the game results are appended to", default="tournament.jsonl"
+)
+
+
+def parse_logic(spec: str) -> Tuple[str, Dict]:
+    name, _, params = spec.partition(":")
+    if name not in CONTROLLERS:
+        raise ValueError("Invalid logic controller: {}".format(name))
+    kwargs = {}
+    for param in filter(None, params.split(",")):
+        key, _, value = param.partition("=")
+        kwargs[key] = ast.literal_eval(value)
+    return name, kwargs
+
+
+def play_game(
+    seed: int,
+    entries: List[Tuple[str, str, Dict]],
+    width: int,
+    height: int,
+    seconds: int,
+) -> Dict:
+    """
+    Play one game in a worker process
+    :param entries: (label, controller name, constructor kwargs) per bot
+    :return: dict with the seed and the score of every bot
+    """
+    random.seed(seed)
+    sim = Simulator(
+        width=width,
+        height=height,
+        config=Config(seconds=seconds),
+        seed=seed,
+    )
+    # Rotate the join order so no entry always moves first
+    shift = seed % len(entries)
+    entries = entries[shift:] + entries[:shift]
+    labels = {}
+    for i, (label, name, kwargs) in enumerate(entries):
+        bot = sim.add_bot("bot{}".format(i), CONTROLLERS[name](**kwargs))
+        labels[bot.name] = label
+    scores = sim.run()
+    return {
+        "seed": seed,
+        "scores": [{"logic": labels[n], "bot": n, "score": s} for n, s in scores.items()],
+    }
+
+
+def _percentile(histogram: Counter, q: float) -> int:
+    total = sum(histogram.values())
+    seen = 0
+    for score in sorted(histogram):
+        seen += histogram[score]
+        if seen >= q * total:
+            return score
+    return 0
+
+
+def main(args):
+    specs = args.logic or list(CONTROLLERS.keys())
+    entries = []
+    for spec in specs:
+        name, kwargs = parse_logic(spec)
+        for _ in range(args.bots_per_logic):
+            entries.append((spec, name, kwargs))
+
+    workers = args.workers or os.cpu_count() or 1
+    # Scores only go into histograms, memory stays flat however many games
+    histograms: Dict[str, Counter] = defaultdict(Counter)
+    seeds = iter(range(args.seed, args.seed + args.games))
+    done = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(args.out, "a") as out:
+        pending = set()
+        while True:
+            # Keep a bounded number of games in flight
+            for seed in seeds:
+                pending.add(
+                    pool.submit(
+                        play_game, seed, entries, args.width, args.height, args.seconds
+                    )
+                )
+                if len(pending) >= workers * 2:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                out.write(json.dumps(result) + "\n")
+                for entry in result["scores"]:
+                    histograms[entry["logic"]][entry["score"]] += 1
+                done += 1
+            out.flush()
+
+    elapsed = time.perf_counter() - start
+    print(
+        "{} games on {} workers in {:.1f} s ({:.1f} games/s), results in {}".format(
+            done, workers, elapsed, done / elapsed, args.out
+        )
+    )
+    ranking = sorted(
+        histograms.items(),
+        key=lambda item: -sum(s * c for s, c in item[1].items()) / sum(item[1].values()),
+    )
+    for label, histogram in ranking:
+        count = sum(histogram.values())
+        mean = sum(s * c for s, c in histogram.items()) / count
+        print(
+            "{:30} mean {:6.1f}  min {:4}  p50 {:4}  p90 {:4}  max {:4}".format(
+                label,
+                mean,
+                min(histogram),
+                _percentile(histogram, 0.5),
+                _percentile(histogram, 0.9),
+                max(histogram),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())